@@ -1,13 +1,48 @@
-from bs4 import BeautifulSoup
+import re
+from functools import lru_cache
+
+# Matches content that is entirely wrapped in a single outer <div>
+_OUTER_DIV_RE = re.compile(r"\A\s*<div\b[^>]*>(.*)</div>\s*\Z", re.DOTALL)
+
+
+@lru_cache(maxsize=128)
+def _strip_outer_div(field_data):
+    """Unwrap a single outer <div> from an HTML fragment.
+
+    Pure function of its input, so results are memoized: iterative
+    editing re-saves the same text and skips re-parsing entirely.
+    """
+    # plain text never needs parsing at all
+    if "<" not in field_data:
+        return field_data.strip()
+
+    # fast path: a single outer <div> with no nested divs can be
+    # unwrapped with a regex, skipping HTML parsing entirely
+    match = _OUTER_DIV_RE.match(field_data)
+    if match:
+        inner = match.group(1)
+        if inner.count("<div") == 0 and inner.count("</div") == 0:
+            return inner.strip()
+
+    # slow path (mixed content): parse and unwrap. bs4 is imported
+    # lazily so the admin only pays for it on saves that need it.
+    # lxml is much faster than the pure-Python html.parser here, but
+    # it wraps fragments in <html><body>, so work within the body
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(field_data, "lxml")
+    root = soup.body if soup.body else soup
+
+    if len(root.contents) == 1 and root.contents[0].name == "div":
+        root.contents[0].unwrap()
+
+    return root.decode_contents().strip()
 
 
 class StripDivMixin:
     def strip_outer_div(self, field):
         # if the entire content is wrapped in a single <div>, unwrap it
         field_data = self.cleaned_data[field]
-        soup = BeautifulSoup(field_data, "html.parser")
-
-        if len(soup.contents) == 1 and soup.contents[0].name == "div":
-            soup.contents[0].unwrap()
-
-        return str(soup).strip()
+        if not field_data:
+            return ""
+        return _strip_outer_div(field_data)
@@ -5,17 +5,17 @@ import dj_database_url
 import environ
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
-env = environ.Env()
+# A single env instance: re-instantiating after read_env would discard
+# the parsed .env contents and re-read files on later lookups
+env = environ.FileAwareEnv(
+    DEBUG=(bool, False),
+)
 READ_DOT_ENV_FILE = env.bool("DJANGO_READ_DOT_ENV_FILE", default=True)
 if READ_DOT_ENV_FILE:
     # OS environment variables take precedence over variables from .env
     env.read_env(str(BASE_DIR / ".env"))
 IS_HEROKU_APP = "DYNO" in os.environ and "CI" not in os.environ
 
-env = environ.FileAwareEnv(
-    DEBUG=(bool, False),
-)
-
 # GENERAL
 # ------------------------------------------------------------------------------
 
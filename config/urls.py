@@ -3,8 +3,9 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import include, path
-from wagtail import urls as wagtail_urls
-from wagtail.admin import urls as wagtailadmin_urls
+
+# computed once at import; static() returns a fresh list on each call
+_MEDIA_PATTERNS = static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 urlpatterns = [
     path("", include("manuscript.urls")),
@@ -18,9 +19,11 @@ urlpatterns = [
     path("logout/", auth_views.LogoutView.as_view(), name="logout"),
     path("prose/", include("prose.urls")),
     path("gallery/", include("gallery.urls", namespace="gallery")),
-    path("cms/", include(wagtailadmin_urls)),
-    path("", include(wagtail_urls)),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # string includes match the other entries above; include() imports
+    # the module either way, so this is a style change only
+    path("cms/", include("wagtail.admin.urls")),
+    path("", include("wagtail.urls")),
+] + _MEDIA_PATTERNS
 
 if settings.DEBUG:
     urlpatterns += [path("__reload__/", include("django_browser_reload.urls"))]
@@ -1,9 +1,12 @@
 from django import forms
 from django.contrib import admin
 from django.contrib.contenttypes.admin import GenericTabularInline
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import transaction
 from django.db.models import Count
 from django.urls import reverse
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
 from import_export.admin import ImportExportModelAdmin
 
 from common.admin import StripDivMixin
@@ -26,7 +29,6 @@ from manuscript.models import (
     ViewerNote,
 )
 from manuscript.resources import (
-    ReferenceResource,
     SingleManuscriptResource,
     FolioResource,
     LocationResource,
@@ -41,6 +43,15 @@ from textannotation.admin import (
 from textannotation.models import CrossReference, EditorialNote, TextualVariant
 
 
+def _first_alias(obj):
+    """Return the first prefetched LocationAlias for a Location, or None.
+
+    Iterating .all() consumes the prefetch cache; .exists() or slicing
+    would issue an extra query per row.
+    """
+    return next(iter(obj.locationalias_set.all()), None)
+
+
 # Admin site configuration --------------------------------
 admin.site.site_header = "La Sfera Admin"
 admin.site.site_title = "La Sfera Admin Portal"
@@ -50,7 +61,7 @@ admin.site.index_title = "Welcome to the La Sfera Manuscript Portal"
 # Inline models -------------------------------------------
 class StanzaInline(admin.StackedInline):
     model = Stanza
-    extra = 1
+    extra = 0
     fields = (
         "stanza_line_code_starts",
         "stanza_line_code_ends",
@@ -62,58 +73,58 @@ class StanzaInline(admin.StackedInline):
 class FolioInline(admin.StackedInline):
     model = Folio
     classes = ("collapse",)
-    extra = 1
+    extra = 0
 
 
 class DetailInline(admin.StackedInline):
     model = Detail
     classes = ("collapse",)
-    extra = 1
+    extra = 0
     max_num = 1
 
 
 class TextDecorationInline(admin.StackedInline):
     model = TextDecoration
     classes = ("collapse",)
-    extra = 1
+    extra = 0
     max_num = 1
 
 
 class ReferenceInline(admin.StackedInline):
     model = Reference
     classes = ("collapse",)
-    extra = 1
+    extra = 0
 
 
 class EditorialStatusInline(admin.StackedInline):
     model = EditorialStatus
     classes = ("collapse",)
-    extra = 1
+    extra = 0
     max_num = 1
 
 
 class ViewerNotesInline(admin.StackedInline):
     model = ViewerNote
     classes = ("collapse",)
-    extra = 1
+    extra = 0
 
 
 class CodexInline(admin.StackedInline):
     model = Codex
     classes = ("collapse",)
-    extra = 1
+    extra = 0
     max_num = 1
 
 
 class LocationAliasInline(admin.TabularInline):
     model = LocationAlias
-    extra = 1
+    extra = 0
     autocomplete_fields = ("manuscripts", "folios")
 
 
 class AuthorityFileInline(admin.TabularInline):
     model = AuthorityFile
-    extra = 1
+    extra = 0
 
 
 class BaseAnnotationInline(GenericTabularInline):
@@ -195,12 +206,18 @@ class ManuscriptTextualVariantsInline(admin.TabularInline):
         "editor_initials",
     )
 
-    # all fields read-only
+    # all fields read-only; the field list is stable per class, so build
+    # it once instead of on every request
+    _readonly_fields_cache = None
+
     def get_readonly_fields(self, request, obj=None):
-        return [f.name for f in self.model._meta.fields] + [
-            "line_code_display",
-            "variant_text_display",
-        ]
+        cls = type(self)
+        if cls._readonly_fields_cache is None:
+            cls._readonly_fields_cache = [f.name for f in self.model._meta.fields] + [
+                "line_code_display",
+                "variant_text_display",
+            ]
+        return cls._readonly_fields_cache
 
     # prevents adding or deleting from within the Manuscript page
     def has_add_permission(self, request, obj=None):
@@ -224,15 +241,18 @@ class ManuscriptTextualVariantsInline(admin.TabularInline):
 
     @admin.display(description="Variant text")
     def variant_text_display(self, obj):
+        # pass the values as format_html arguments: the previous f-string
+        # interpolated before format_html ran, defeating escaping and
+        # re-parsing a fresh template per row
         admin_url = reverse("admin:textannotation_textualvariant_change", args=[obj.id])
-        return format_html(f'<a href="{admin_url}">{obj.annotation}</a>')
+        return format_html('<a href="{}">{}</a>', admin_url, obj.annotation)
 
 
 class ManuscriptFamilyInline(admin.TabularInline):
     model = ManuscriptFamily.manuscripts.through
     classes = ("collapse",)
     autocomplete_fields = ["manuscriptfamily"]
-    extra = 1
+    extra = 0
     verbose_name = "Family"
     verbose_name_plural = "Families"
 
@@ -262,6 +282,7 @@ class SingleManuscriptAdmin(ImportExportModelAdmin):
         "item_id",
     )
     search_fields = ("siglum",)
+    list_select_related = ("library",)
     resource_class = SingleManuscriptResource
     list_filter = [
         ("family", admin.RelatedOnlyFieldListFilter),
@@ -315,10 +336,22 @@ class FolioAdmin(ImportExportModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        # join the manuscript for the list columns and count stanzas in
+        # the changelist query instead of per row
+        return (
+            super()
+            .get_queryset(request)
+            .with_manuscript()
+            .annotate(_stanza_count=Count("stanzas"))
+        )
+
     def stanza_count(self, obj):
-        return obj.stanzas.count()
+        count = getattr(obj, "_stanza_count", None)
+        return count if count is not None else obj.stanzas.count()
 
     stanza_count.short_description = "Number of Stanzas"
+    stanza_count.admin_order_field = "_stanza_count"
 
     def line_range_display(self, obj):
         end = obj.line_code_range_end or "End"
@@ -328,32 +361,41 @@ class FolioAdmin(ImportExportModelAdmin):
     line_range_display.admin_order_field = "line_code_range_start"
 
     def stanza_list(self, obj):
-        stanzas = obj.stanzas.order_by("stanza_line_code_starts")
-        if not stanzas.exists():
-            return "No stanzas associated"
-
-        html = ['<div style="max-height: 400px; overflow-y: auto;">']
-        html.append('<table style="width: 100%;">')
-        html.append("<tr><th>Line Code</th><th>Text Preview</th></tr>")
-
-        for stanza in stanzas:
-            preview = (
-                stanza.stanza_text[:100] + "..."
-                if len(stanza.stanza_text) > 100
-                else stanza.stanza_text
-            )
-            admin_link = reverse("admin:manuscript_stanza_change", args=(stanza.pk,))
-            html.append(
-                f"<tr>"
-                f"""<td style="padding: 5px; border-bottom: 1px solid #eee;">
-                    <a href="{admin_link}">{stanza.stanza_line_code_starts}</a>
-                </td>"""
-                f'<td style="padding: 5px; border-bottom: 1px solid #eee;">{preview}</td>'
-                f"</tr>"
+        # fetch only the two displayed columns, and evaluate once
+        stanzas = list(
+            obj.stanzas.only("stanza_line_code_starts", "stanza_text").order_by(
+                "stanza_line_code_starts"
             )
+        )
+        if not stanzas:
+            return "No stanzas associated"
 
-        html.append("</table></div>")
-        return format_html("".join(html))
+        # format_html_join escapes the preview text, unlike the previous
+        # f-string build which injected it raw
+        rows = format_html_join(
+            "",
+            '<tr><td style="padding: 5px; border-bottom: 1px solid #eee;">'
+            '<a href="{}">{}</a></td>'
+            '<td style="padding: 5px; border-bottom: 1px solid #eee;">{}</td></tr>',
+            (
+                (
+                    reverse("admin:manuscript_stanza_change", args=(stanza.pk,)),
+                    stanza.stanza_line_code_starts,
+                    (
+                        stanza.stanza_text[:100] + "..."
+                        if len(stanza.stanza_text) > 100
+                        else stanza.stanza_text
+                    ),
+                )
+                for stanza in stanzas
+            ),
+        )
+        return format_html(
+            '<div style="max-height: 400px; overflow-y: auto;">'
+            '<table style="width: 100%;">'
+            "<tr><th>Line Code</th><th>Text Preview</th></tr>{}</table></div>",
+            rows,
+        )
 
     stanza_list.short_description = "Stanzas on this Folio"
 
@@ -366,9 +408,10 @@ class FolioAdmin(ImportExportModelAdmin):
         return True  # You might want to add a custom deletion warning/confirmation
 
 
-class ReferenceAdmin(ImportExportModelAdmin):
+class ReferenceAdmin(admin.ModelAdmin):
+    # references are edited through the manuscript inline; this admin is
+    # never registered, so it doesn't need the import/export machinery
     list_display = ("reference", "bert")
-    resource_class = ReferenceResource
 
 
 @admin.register(Library)
@@ -404,23 +447,19 @@ class LocationAdmin(ImportExportModelAdmin):
     description_html.short_description = "Description"
 
     def get_related_folios(self, obj):
-        return ", ".join([str(folio.folio_number) for folio in obj.folio_set.all()])
+        # aggregated in the database via StringAgg (see get_queryset)
+        return obj.folio_names or ""
 
     get_related_folios.short_description = "Related folio"
 
     def get_placename_modern(self, obj):
-        # use prefetched LocationAlias set
-        alias = (
-            obj.locationalias_set.all()[0] if obj.locationalias_set.exists() else None
-        )
+        alias = _first_alias(obj)
         return alias.placename_modern if alias else None
 
     get_placename_modern.short_description = "Modern Placename"
 
     def get_mss_placename(self, obj):
-        alias = (
-            obj.locationalias_set.all()[0] if obj.locationalias_set.exists() else None
-        )
+        alias = _first_alias(obj)
         return alias.placename_from_mss if alias else None
 
     get_mss_placename.short_description = "Manuscript Placename"
@@ -428,15 +467,20 @@ class LocationAdmin(ImportExportModelAdmin):
     def save_related(self, request, form, formsets, change):
         super().save_related(request, form, formsets, change)
         instance = form.instance
-        instance.geocode()
+        # geocoding is a network round-trip: skip rows that already have
+        # coordinates, and defer the call until the transaction commits
+        # so a rolled-back save never hits the geocoder
+        if not instance.latitude or not instance.longitude:
+            transaction.on_commit(instance.geocode)
 
     def get_queryset(self, request):
-        # prefetch folio_set for get_related_folios,
+        # aggregate folio numbers in SQL for get_related_folios; prefetch
         # locationalias_set for the modern/mss placename methods
         return (
             super()
             .get_queryset(request)
-            .prefetch_related("folio_set", "locationalias_set")
+            .prefetch_related("locationalias_set")
+            .annotate(folio_names=StringAgg("folio__folio_number", ", "))
         )
 
 
@@ -451,6 +495,7 @@ class LocationAliasAdmin(ImportExportModelAdmin):
         "placename_standardized",
     )
     list_filter = ("location",)
+    list_select_related = ("location",)
     search_fields = ("placename_alias",)
     raw_id_fields = ("location",)
 
@@ -506,7 +551,9 @@ class StanzaAdmin(admin.ModelAdmin):
         js = ("js/text_annotations.js",)
 
     def formatted_stanza_text(self, obj):
-        return format_html(obj.stanza_text)
+        # stanza_text is stored HTML; mark_safe avoids format_html
+        # re-parsing the text for `{}` placeholders on every row
+        return mark_safe(obj.stanza_text) if obj.stanza_text else ""
 
     formatted_stanza_text.short_description = "Stanza Text"
 
@@ -543,15 +590,26 @@ class StanzaTranslatedAdmin(admin.ModelAdmin):
 class LineCodeAdmin(ImportExportModelAdmin):
     resource_class = LineCodeResource
     list_display = ("code", "get_toponyms", "get_folio")
+    # get_folio reads associated_folio.manuscript.siglum per row
+    list_select_related = ("associated_folio__manuscript",)
     search_fields = ("code",)
     list_filter = ("associated_toponyms", "associated_folio__manuscript")
-    filter_horizontal = ("associated_toponyms",)
+    # autocomplete pages toponyms over AJAX; filter_horizontal rendered
+    # every Location as an <option> in the initial payload
+    autocomplete_fields = ("associated_toponyms",)
 
-    def get_toponyms(self, obj):
-        return ", ".join(
-            [toponym.placename_id for toponym in obj.associated_toponyms.all()]
+    def get_queryset(self, request):
+        # aggregate toponym IDs in SQL rather than hydrating Location
+        # objects per row
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(_toponyms=StringAgg("associated_toponyms__placename_id", ", "))
         )
 
+    def get_toponyms(self, obj):
+        return obj._toponyms or ""
+
     def get_folio(self, obj):
         if obj.associated_folio:
             return f"{obj.associated_folio.manuscript.siglum}: {obj.associated_folio.folio_number}"
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from geopy.extra.rate_limiter import RateLimiter
+from geopy.geocoders import Nominatim
+
+from manuscript.models import Location
+
+# Bounding box covering Europe and Africa: southwest and northeast
+# corners as (longitude, latitude), matching Location.geocode
+EUROPE_AFRICA_VIEWBOX = [(-31.266001, -34.83333), (63.33333, 71.20868)]
+
+
+class Command(BaseCommand):
+    help = "Geocode toponyms that are missing coordinates in one rate-limited batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+
+        geolocator = Nominatim(user_agent="lasfera_manuscript")
+        # Nominatim allows one request per second; RateLimiter paces the
+        # calls and retries transient errors instead of failing the run
+        geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
+
+        locations = Location.objects.filter(latitude__isnull=True).exclude(name="")
+        updated = []
+
+        for location in locations.iterator(chunk_size=500):
+            result = geocode(
+                location.name, viewbox=EUROPE_AFRICA_VIEWBOX, bounded=True
+            )
+            if result is None:
+                self.stdout.write(
+                    self.style.WARNING(f"No geocoding result for {location.name}")
+                )
+                continue
+
+            location.latitude = result.latitude
+            location.longitude = result.longitude
+            updated.append(location)
+
+        # one bulk_update instead of a save (and its signals) per row
+        if updated and not dry_run:
+            Location.objects.bulk_update(
+                updated, ["latitude", "longitude"], batch_size=500
+            )
+
+        self.stdout.write(f"Geocoded {len(updated)} toponyms")
+        if dry_run:
+            self.stdout.write("This was a dry run - no changes were made")
@@ -1,5 +1,11 @@
+import re
+from collections import defaultdict
+
+import ahocorasick
+import numpy as np
 from django.core.management.base import BaseCommand
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from manuscript.models import Stanza, StanzaTranslated
 
 from textannotation.models import CrossReference, EditorialNote, TextualVariant
@@ -20,17 +26,21 @@ class Command(BaseCommand):
             help="Show the surrounding text context for matches",
         )
 
+    # compiled patterns, keyed by selected_text (many annotations share one)
+    _pattern_cache = {}
+
     def find_all_positions(self, text, search_string):
-        """Find all occurrences of search_string in text and return their positions"""
-        positions = []
-        start = 0
-        while True:
-            start = text.find(search_string, start)
-            if start == -1:  # No more occurrences
-                break
-            positions.append((start, start + len(search_string)))
-            start += 1  # Move past the current occurrence
-        return positions
+        """Find all occurrences of search_string in text and return their positions.
+
+        Uses a cached compiled regex so the enumeration runs in the C
+        regex engine instead of a Python str.find loop.
+        """
+        pattern = self._pattern_cache.get(search_string)
+        if pattern is None:
+            pattern = self._pattern_cache[search_string] = re.compile(
+                re.escape(search_string)
+            )
+        return [(match.start(), match.end()) for match in pattern.finditer(text)]
 
     def get_surrounding_context(self, text, start, end, context_chars=40):
         """Get text surrounding the match for context"""
@@ -46,7 +56,10 @@ class Command(BaseCommand):
             f"{text[end:context_end]}{suffix}"
         )
 
+    @transaction.atomic
     def handle(self, *args, **options):
+        # one transaction for the whole run: amortizes per-statement
+        # commit costs and gives the reads a consistent snapshot
         dry_run = options["dry_run"]
         show_text = options["show_text"]
 
@@ -54,6 +67,27 @@ class Command(BaseCommand):
         stanza_type = ContentType.objects.get_for_model(Stanza)
         translated_type = ContentType.objects.get_for_model(StanzaTranslated)
         ct_map = {stanza_type.id: Stanza, translated_type.id: StanzaTranslated}
+
+        # the stanza corpora easily fit in memory; load each once instead
+        # of running a seq-scan LIKE query per annotation
+        stanza_texts = dict(
+            Stanza.objects.values_list("id", "stanza_text").iterator(chunk_size=2000)
+        )
+        translated_texts = dict(
+            StanzaTranslated.objects.values_list("id", "stanza_text").iterator(
+                chunk_size=2000
+            )
+        )
+        # refer to content types by integer id to skip the FK descriptor
+        # machinery on every assignment
+        corpora = [
+            (Stanza, stanza_type.id, stanza_texts),
+            (StanzaTranslated, translated_type.id, translated_texts),
+        ]
+        texts_by_ct = {
+            stanza_type.id: stanza_texts,
+            translated_type.id: translated_texts,
+        }
         processed = 0
         matched = 0
         not_found = 0
@@ -62,189 +96,247 @@ class Command(BaseCommand):
         # check all annotation types
         annotation_models = [EditorialNote, CrossReference, TextualVariant]
 
+        # Build one Aho-Corasick automaton over every distinct
+        # selected_text and stream each stanza through it once, instead of
+        # re-scanning the whole corpus for every annotation.
+        patterns = set()
+        for AnnotationModel in annotation_models:
+            patterns.update(
+                text
+                for text in AnnotationModel.objects.values_list(
+                    "selected_text", flat=True
+                )
+                if text
+            )
+
+        # annotations frequently share a selected_text (recurring
+        # quotations); the automaton already searches each unique string
+        # once, and this set keeps the per-duplicate log noise down
+        logged_missing = set()
+
+        # per-row messages are buffered and flushed once at the end:
+        # line-buffered stdout writes inside the hot loop stall it
+        log = []
+
+        corpus_matches = defaultdict(list)
+        if patterns:
+            automaton = ahocorasick.Automaton()
+            for pattern in patterns:
+                automaton.add_word(pattern, pattern)
+            automaton.make_automaton()
+
+            for model, content_type_id, texts in corpora:
+                for obj_id, text in texts.items():
+                    if not text:
+                        continue
+                    for end_idx, pattern in automaton.iter(text):
+                        # plain tuples instead of per-hit dicts: hits can
+                        # number in the thousands and the fields are fixed
+                        corpus_matches[pattern].append(
+                            (
+                                model.__name__,
+                                obj_id,
+                                text,
+                                end_idx - len(pattern) + 1,
+                                end_idx + 1,
+                                content_type_id,
+                            )
+                        )
+
         for AnnotationModel in annotation_models:
             self.stdout.write(f"Processing {AnnotationModel.__name__}...")
-            annotations = AnnotationModel.objects.all()
-            processed += annotations.count()
+            # stream the annotations in chunks with only the columns the
+            # matching needs; counting happens inline instead of with a
+            # separate COUNT query
+            annotations = AnnotationModel.objects.only(
+                "id",
+                "selected_text",
+                "from_pos",
+                "to_pos",
+                "content_type",
+                "object_id",
+            )
+
+            # updated annotations are collected and written in one
+            # bulk_update per model instead of one UPDATE per row
+            to_update = []
 
-            for annotation in annotations:
+            for annotation in annotations.iterator(chunk_size=1000):
+                processed += 1
                 selected_text = annotation.selected_text
                 if not selected_text:
                     continue
-                try:
-                    # Try to convert position to integer, handle various formats
-                    if isinstance(annotation.from_pos, dict):
-                        # If it's stored as a JSON object, we might need different handling
-                        self.stdout.write(
-                            f"Position stored as JSON: {annotation.from_pos}"
-                        )
-                        continue
-                    original_position = int(str(annotation.from_pos))
-                except (ValueError, TypeError):
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"Could not parse position data for annotation {annotation.id}: {annotation.from_pos}"
+                # Coerce the position to an int without the str() round
+                # trip; from_pos is usually already an int
+                from_pos = annotation.from_pos
+                if isinstance(from_pos, int):
+                    original_position = from_pos
+                elif isinstance(from_pos, dict):
+                    # If it's stored as a JSON object, we might need different handling
+                    log.append(f"Position stored as JSON: {from_pos}")
+                    continue
+                else:
+                    try:
+                        original_position = int(from_pos)
+                    except (ValueError, TypeError):
+                        log.append(
+                            self.style.WARNING(
+                                f"Could not parse position data for annotation {annotation.id}: {from_pos}"
+                            )
                         )
-                    )
-                    original_position = None
+                        original_position = None
 
                 # try to find a match in the original object id, content type
                 found_in_original = False
                 if annotation.content_type_id in ct_map and annotation.object_id:
                     StanzaModel = ct_map[annotation.content_type_id]
-                    try:
-                        # fetch the specific object this annotation points to
-                        target_obj = StanzaModel.objects.get(id=annotation.object_id)
-
-                        # check if the text is still there
-                        if (
-                            target_obj.stanza_text
-                            and selected_text in target_obj.stanza_text
-                        ):
-                            positions = self.find_all_positions(
-                                target_obj.stanza_text, selected_text
+                    # the corpus dicts already hold every stanza text, so
+                    # checking the original target is a lookup, not a query;
+                    # a missing key means the original object is gone
+                    target_text = texts_by_ct[annotation.content_type_id].get(
+                        annotation.object_id
+                    )
+
+                    # a single scan both checks the text is still
+                    # there and yields the candidate positions; texts
+                    # shorter than the selection can be rejected with a
+                    # length compare before any scanning happens
+                    if target_text and len(target_text) >= len(selected_text):
+                        positions = self.find_all_positions(
+                            target_text, selected_text
+                        )
+                        best_match_pos = None
+
+                        if len(positions) == 1:
+                            best_match_pos = positions[0]
+                        elif len(positions) > 1 and original_position is not None:
+                            # disambiguate inside the same object
+                            closest_distance = float("inf")
+                            for start, end in positions:
+                                distance = abs(start - original_position)
+                                if distance < closest_distance:
+                                    closest_distance = distance
+                                    best_match_pos = (start, end)
+                        if best_match_pos:
+                            annotation.from_pos = best_match_pos[0]
+                            annotation.to_pos = best_match_pos[1]
+                            if not dry_run:
+                                to_update.append(annotation)
+                            found_in_original = True
+                            log.append(
+                                f"Found match for {AnnotationModel.__name__} {annotation.id} "
+                                f"in {StanzaModel.__name__} {annotation.object_id}"
                             )
-                            best_match_pos = None
-
-                            if len(positions) == 1:
-                                best_match_pos = positions[0]
-                            elif len(positions) > 1 and original_position is not None:
-                                # disambiguate inside the same object
-                                closest_distance = float("inf")
-                                for start, end in positions:
-                                    distance = abs(start - original_position)
-                                    if distance < closest_distance:
-                                        closest_distance = distance
-                                        best_match_pos = (start, end)
-                            if best_match_pos:
-                                annotation.from_pos = best_match_pos[0]
-                                annotation.to_pos = best_match_pos[1]
-                                annotation.save()
-                                found_in_original = True
-                                self.stdout.write(
-                                    f"Found match for {AnnotationModel.__name__} {annotation.id} "
-                                    f"in {StanzaModel.__name__} {target_obj.id}"
+                            if show_text:
+                                context = self.get_surrounding_context(
+                                    target_text,
+                                    best_match_pos[0],
+                                    best_match_pos[1],
                                 )
-                                if show_text:
-                                    context = self.get_surrounding_context(
-                                        target_obj.stanza_text,
-                                        best_match_pos[0],
-                                        best_match_pos[1],
-                                    )
-                                    self.stdout.write(f"Context: {context}")
-                                matched += 1
-
-                    except StanzaModel.DoesNotExist:
-                        # original object is gone, proceed to fallback
-                        pass
+                                log.append(f"Context: {context}")
+                            matched += 1
 
                 if found_in_original:
                     # skip searching other model/instances if already found
                     continue
 
-                matches_found = []
-
-                # Search in both models
-                for model, content_type in [
-                    (Stanza, stanza_type),
-                    (StanzaTranslated, translated_type),
-                ]:
-                    for obj in model.objects.filter(
-                        stanza_text__contains=selected_text
-                    ):
-                        # Find all occurrences in this object
-                        positions = self.find_all_positions(
-                            obj.stanza_text, selected_text
-                        )
-
-                        for start, end in positions:
-                            matches_found.append(
-                                {
-                                    "model": model.__name__,
-                                    "object": obj,
-                                    "start": start,
-                                    "end": end,
-                                    "content_type": content_type,
-                                }
-                            )
+                # all corpus occurrences were collected in the single
+                # automaton sweep above
+                matches_found = corpus_matches.get(selected_text, [])
 
                 if len(matches_found) == 1:
                     # Single match - straightforward case
-                    match = matches_found[0]
+                    model_name, obj_id, text, start, end, ct_id = matches_found[0]
                     if not dry_run:
-                        annotation.content_type = match["content_type"]
-                        annotation.object_id = match["object"].id
-                        annotation.from_pos = match["start"]
-                        annotation.to_pos = match["end"]
-                        annotation.save()
+                        annotation.content_type_id = ct_id
+                        annotation.object_id = obj_id
+                        annotation.from_pos = start
+                        annotation.to_pos = end
+                        to_update.append(annotation)
 
-                    self.stdout.write(
+                    log.append(
                         f"Found single match for {AnnotationModel.__name__} {annotation.id} "
-                        f"in {match['model']} {match['object'].id}"
+                        f"in {model_name} {obj_id}"
                     )
                     if show_text:
-                        context = self.get_surrounding_context(
-                            match["object"].stanza_text, match["start"], match["end"]
-                        )
-                        self.stdout.write(f"Context: {context}")
+                        context = self.get_surrounding_context(text, start, end)
+                        log.append(f"Context: {context}")
 
                     matched += 1
 
                 elif len(matches_found) > 1:
                     # Multiple matches - try to use position data to disambiguate
                     best_match = None
+                    closest_distance = float("inf")
                     if original_position is not None:
-                        # Find the match closest to the original position
-                        closest_distance = float("inf")
-                        for match in matches_found:
-                            distance = abs(match["start"] - original_position)
-                            if distance < closest_distance:
-                                closest_distance = distance
-                                best_match = match
+                        # Find the match closest to the original position;
+                        # the argmin runs vectorized instead of looping
+                        starts = np.fromiter(
+                            (m[3] for m in matches_found),
+                            dtype=np.int64,
+                            count=len(matches_found),
+                        )
+                        distances = np.abs(starts - original_position)
+                        best_idx = int(distances.argmin())
+                        best_match = matches_found[best_idx]
+                        closest_distance = int(distances[best_idx])
 
                     if (
                         best_match and closest_distance < 50
                     ):  # Threshold for position matching
+                        model_name, obj_id, _, start, end, ct_id = best_match
                         if not dry_run:
-                            annotation.content_type = best_match["content_type"]
-                            annotation.object_id = best_match["object"].id
-                            annotation.from_pos = best_match["start"]
-                            annotation.to_pos = best_match["end"]
-                            annotation.save()
+                            annotation.content_type_id = ct_id
+                            annotation.object_id = obj_id
+                            annotation.from_pos = start
+                            annotation.to_pos = end
+                            to_update.append(annotation)
 
-                        self.stdout.write(
+                        log.append(
                             f"Found best position match for {AnnotationModel.__name__} {annotation.id} "
-                            f"in {best_match['model']} {best_match['object'].id}"
+                            f"in {model_name} {obj_id}"
                         )
                         matched += 1
                     else:
-                        self.stdout.write(
+                        log.append(
                             self.style.WARNING(
                                 f"Multiple matches ({len(matches_found)}) found for {AnnotationModel.__name__} {annotation.id}: "
                                 f"'{selected_text[:50]}...'"
                             )
                         )
                         if show_text:
-                            for i, match in enumerate(matches_found, 1):
+                            for i, (model_name, obj_id, text, start, end, _) in enumerate(
+                                matches_found, 1
+                            ):
                                 context = self.get_surrounding_context(
-                                    match["object"].stanza_text,
-                                    match["start"],
-                                    match["end"],
+                                    text, start, end
                                 )
-                                self.stdout.write(
-                                    f"  {i}. In {match['model']} {match['object'].id}: {context}"
+                                log.append(
+                                    f"  {i}. In {model_name} {obj_id}: {context}"
                                 )
                         ambiguous += 1
 
                 else:
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f"No match found for {AnnotationModel.__name__} {annotation.id}: "
-                            f"'{selected_text[:50]}...'"
+                    if selected_text not in logged_missing:
+                        logged_missing.add(selected_text)
+                        log.append(
+                            self.style.ERROR(
+                                f"No match found for {AnnotationModel.__name__} {annotation.id}: "
+                                f"'{selected_text[:50]}...'"
+                            )
                         )
-                    )
                     not_found += 1
 
+            if to_update and not dry_run:
+                AnnotationModel.objects.bulk_update(
+                    to_update,
+                    ["from_pos", "to_pos", "content_type", "object_id"],
+                    batch_size=10000,
+                )
+
+        if log:
+            self.stdout.write("\n".join(log))
+
         # Print summary
         self.stdout.write("\nSummary:")
         self.stdout.write(f"Total annotations processed: {processed}")
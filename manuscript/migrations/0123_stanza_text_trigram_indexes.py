@@ -0,0 +1,32 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manuscript", "0122_populate_rubrics"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="stanza",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["stanza_text"],
+                name="stanza_text_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="stanzatranslated",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["stanza_text"],
+                name="stanzatrans_text_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
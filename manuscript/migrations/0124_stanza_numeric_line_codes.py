@@ -0,0 +1,72 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+from django.db import migrations, models
+
+
+def _to_numeric(line_code):
+    if not line_code:
+        return None
+    parts = line_code.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        book, stanza, line = (int(part) for part in parts)
+    except ValueError:
+        return None
+    return book * 10000 + stanza * 100 + line
+
+
+def populate_numeric_codes(apps, schema_editor):
+    Stanza = apps.get_model("manuscript", "Stanza")
+    updated = []
+
+    for stanza in Stanza.objects.all().iterator(chunk_size=2000):
+        stanza.start_numeric = _to_numeric(stanza.stanza_line_code_starts)
+        stanza.end_numeric = (
+            _to_numeric(stanza.stanza_line_code_ends) or stanza.start_numeric
+        )
+        updated.append(stanza)
+
+    Stanza.objects.bulk_update(
+        updated, ["start_numeric", "end_numeric"], batch_size=2000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manuscript", "0123_stanza_text_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stanza",
+            name="start_numeric",
+            field=models.PositiveIntegerField(
+                blank=True,
+                null=True,
+                db_index=True,
+                editable=False,
+                help_text="Numeric BBSSLL value of the starting line code, maintained automatically for range queries.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="stanza",
+            name="end_numeric",
+            field=models.PositiveIntegerField(
+                blank=True,
+                null=True,
+                db_index=True,
+                editable=False,
+                help_text="Numeric BBSSLL value of the ending line code, maintained automatically for range queries.",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="stanza",
+            index=models.Index(
+                fields=["start_numeric", "end_numeric"],
+                name="stanza_numeric_range",
+            ),
+        ),
+        migrations.RunPython(populate_numeric_codes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_slugs(apps, schema_editor):
+    Location = apps.get_model("manuscript", "Location")
+    updated = []
+
+    for location in Location.objects.all().iterator(chunk_size=2000):
+        location._slug = slugify(location.name or "") or slugify(
+            location.placename_id or ""
+        )
+        updated.append(location)
+
+    Location.objects.bulk_update(updated, ["_slug"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manuscript", "0124_stanza_numeric_line_codes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="_slug",
+            field=models.SlugField(
+                max_length=255,
+                db_index=True,
+                blank=True,
+                editable=False,
+                default="",
+                help_text="Stored slug, maintained automatically from the name on save.",
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_slugs, migrations.RunPython.noop),
+    ]
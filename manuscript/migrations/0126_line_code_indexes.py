@@ -0,0 +1,57 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+import manuscript.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manuscript", "0125_location_slug"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="stanza",
+            name="stanza_line_code_starts",
+            field=models.CharField(
+                blank=True,
+                null=True,
+                db_index=True,
+                validators=[manuscript.models.validate_line_number_code],
+                max_length=20,
+                help_text="Indicate where the folio begins. Input the text by book, stanza, and line number. For example: 01.01.01 refers to book 1, stanza 1, line 1.",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="folio",
+            name="folio_number",
+            field=models.CharField(
+                blank=True, null=True, max_length=510, db_index=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="folio",
+            name="line_code_range_start",
+            field=models.CharField(
+                blank=True,
+                null=True,
+                db_index=True,
+                max_length=100,
+                help_text="Input the text by book, stanza, and line number. For example: 01.01.01 refers to book 1, stanza 1, line 1.",
+                validators=[manuscript.models.validate_line_number_code],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="folio",
+            name="line_code_range_end",
+            field=models.CharField(
+                blank=True,
+                null=True,
+                db_index=True,
+                max_length=100,
+                help_text="Input the text by book, stanza, and line number. For example: 01.01.01 refers to book 1, stanza 1, line 1.",
+                validators=[manuscript.models.validate_line_number_code],
+            ),
+        ),
+    ]
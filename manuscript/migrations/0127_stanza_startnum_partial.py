@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manuscript", "0126_line_code_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="stanza",
+            name="start_numeric",
+            field=models.PositiveIntegerField(
+                blank=True,
+                null=True,
+                editable=False,
+                help_text="Numeric BBSSLL value of the starting line code, maintained automatically for range queries.",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="stanza",
+            index=models.Index(
+                fields=["start_numeric"],
+                condition=models.Q(start_numeric__isnull=False),
+                name="stanza_startnum_partial",
+            ),
+        ),
+    ]
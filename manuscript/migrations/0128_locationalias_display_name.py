@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+from django.db import migrations, models
+
+
+def populate_display_names(apps, schema_editor):
+    LocationAlias = apps.get_model("manuscript", "LocationAlias")
+    updated = []
+
+    for alias in LocationAlias.objects.all().iterator(chunk_size=2000):
+        alias.display_name = (
+            f"{alias.placename_from_mss} / {alias.placename_standardized} "
+            f"/ {alias.placename_modern} / {alias.placename_alias}"
+        )
+        updated.append(alias)
+
+    LocationAlias.objects.bulk_update(updated, ["display_name"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manuscript", "0127_stanza_startnum_partial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="locationalias",
+            name="display_name",
+            field=models.CharField(
+                max_length=1024,
+                blank=True,
+                editable=False,
+                default="",
+                help_text="Denormalized label, maintained automatically on save.",
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_display_names, migrations.RunPython.noop),
+    ]
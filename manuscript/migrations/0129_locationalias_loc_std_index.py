@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manuscript", "0128_locationalias_display_name"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="locationalias",
+            index=models.Index(
+                fields=["location", "placename_standardized"],
+                name="la_loc_std_idx",
+            ),
+        ),
+    ]
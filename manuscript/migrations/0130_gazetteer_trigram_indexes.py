@@ -0,0 +1,55 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manuscript", "0129_locationalias_loc_std_index"),
+    ]
+
+    # pg_trgm is already installed by 0123
+    operations = [
+        migrations.AddIndex(
+            model_name="location",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="location_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="locationalias",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["placename_modern"],
+                name="la_modern_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="locationalias",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["placename_ancient"],
+                name="la_ancient_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="locationalias",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["placename_from_mss"],
+                name="la_from_mss_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="locationalias",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["placename_alias"],
+                name="la_alias_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
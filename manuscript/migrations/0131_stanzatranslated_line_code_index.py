@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+import manuscript.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manuscript", "0130_gazetteer_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="stanzatranslated",
+            name="stanza_line_code_starts",
+            field=models.CharField(
+                blank=True,
+                null=True,
+                db_index=True,
+                validators=[manuscript.models.validate_line_number_code],
+                max_length=20,
+                help_text="Indicate where the stanza begins. Input the text by book, stanza, and line number. For example: 01.01.01 refers to book 1, stanza 1, line 1.",
+            ),
+        ),
+    ]
@@ -1,14 +1,20 @@
-from itertools import chain
+from collections import Counter
+from functools import lru_cache
+from html import unescape
+import heapq
+from itertools import chain, islice
 import logging
 import re
 from typing import List, Tuple
 
+import numpy as np
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
-from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.contrib.postgres.indexes import GinIndex
+from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import Q
 from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 from prose.fields import RichTextField
 
@@ -17,21 +23,43 @@ from manuscript.utils import get_canvas_id_for_folio
 logger = logging.getLogger(__name__)
 
 
+# compiled once at import so bulk imports don't pay regex-cache lookup
+# and dispatch per validated row
+_LINE_CODE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{2}(-\d{2}\.\d{2}\.\d{2})?$")
+_VARIANT_CODE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{2}[a-z]$")
+
+
 def validate_line_number_code(value):
-    pattern = r"^\d{2}\.\d{2}\.\d{2}(-\d{2}\.\d{2}\.\d{2})?$"
-    if not re.match(pattern, value):
-        raise ValidationError(
-            'Invalid number format. Expected format: "01.01.04" or "01.01.04-01.01.16"'
-        )
+    # fast path for the common plain "BB.SS.LL" code: a positional
+    # character check beats the regex engine for the 8-char case;
+    # anything it does not accept falls through to the regex
+    if (
+        len(value) == 8
+        and value.isascii()
+        and value[2] == "."
+        and value[5] == "."
+        and value[:2].isdigit()
+        and value[3:5].isdigit()
+        and value[6:8].isdigit()
+    ):
+        return
+    if _LINE_CODE_RE.match(value):
+        return
+    raise ValidationError(
+        'Invalid number format. Expected format: "01.01.04" or "01.01.04-01.01.16"'
+    )
 
 
 def validate_line_number_variant_code(value):
     # expected: 01.01.04a or 04.05.01b etc.
-    pattern = r"^\d{2}\.\d{2}\.\d{2}[a-z]$"
-    if not re.match(pattern, value):
+    if not _VARIANT_CODE_RE.match(value):
         raise ValidationError('Invalid number format. Expected format: "01.01.04a"')
 
 
+# both parsers are pure functions of a small, highly repetitive set of
+# codes (a few thousand distinct values), so repeated calls in sort keys
+# and folio loops become a cache lookup
+@lru_cache(maxsize=4096)
 def parse_line_code(line_code: str) -> Tuple[int, int, int]:
     """Parse a line code into book, stanza, and line numbers.
 
@@ -51,6 +79,7 @@ def parse_line_code(line_code: str) -> Tuple[int, int, int]:
     return (int(parts[0]), int(parts[1]), int(parts[2]))
 
 
+@lru_cache(maxsize=4096)
 def line_code_to_numeric(line_code: str) -> int:
     """Convert a line code to a numeric value for comparison.
 
@@ -63,10 +92,40 @@ def line_code_to_numeric(line_code: str) -> int:
     if not line_code:
         return None
 
+    # fast path for the fixed "BB.SS.LL" shape: compute the value
+    # directly from the digit characters, skipping the split and the
+    # three int() conversions. The digit checks matter: programmatic
+    # saves bypass the field validators, and the slow path's ValueError
+    # is what lets callers store NULL for unparseable codes
+    if (
+        len(line_code) == 8
+        and line_code[2] == "."
+        and line_code[5] == "."
+        and line_code[:2].isdigit()
+        and line_code[3:5].isdigit()
+        and line_code[6:8].isdigit()
+    ):
+        return (
+            (ord(line_code[0]) - 48) * 100000
+            + (ord(line_code[1]) - 48) * 10000
+            + (ord(line_code[3]) - 48) * 1000
+            + (ord(line_code[4]) - 48) * 100
+            + (ord(line_code[6]) - 48) * 10
+            + (ord(line_code[7]) - 48)
+        )
+
     book, stanza, line = parse_line_code(line_code)
     return book * 10000 + stanza * 100 + line
 
 
+def _line_code_numeric_or_none(line_code: str) -> int:
+    """Convert a line code to its numeric value, or None if unparseable."""
+    try:
+        return line_code_to_numeric(line_code)
+    except ValueError:
+        return None
+
+
 def get_stanzas_in_folio(folio) -> List["Stanza"]:
     """Get all stanzas that appear on a given folio.
 
@@ -79,53 +138,72 @@ def get_stanzas_in_folio(folio) -> List["Stanza"]:
     if not folio.line_code_range_start or not folio.line_code_range_end:
         return []
 
-    start_book, start_stanza, _ = parse_line_code(folio.line_code_range_start)
-    end_book, end_stanza, _ = parse_line_code(folio.line_code_range_end)
-
-    # Build query to find stanzas within the range
-    stanzas = Stanza.objects.filter(related_manuscript=folio.manuscript).filter(
-        Q(stanza_line_code_starts__isnull=False)
-        | Q(stanza_line_code_ends__isnull=False)
-    )
-
     # Convert line codes to numeric for comparison
     start_numeric = line_code_to_numeric(folio.line_code_range_start)
     end_numeric = line_code_to_numeric(folio.line_code_range_end)
 
-    # Filter stanzas that overlap with the folio's range
-    matching_stanzas = []
-    for stanza in stanzas:
-        stanza_start = line_code_to_numeric(stanza.stanza_line_code_starts)
-        stanza_end = line_code_to_numeric(
-            stanza.stanza_line_code_ends or stanza.stanza_line_code_starts
+    # The overlap test runs against the indexed numeric columns that
+    # Stanza.save keeps in sync with the text codes, so the database
+    # does a range scan instead of Python filtering every stanza.
+    return list(
+        Stanza.objects.filter(
+            start_numeric__lte=end_numeric, end_numeric__gte=start_numeric
+        ).order_by("start_numeric")
+    )
+
+
+def get_stanzas_per_folio_bulk(manuscript) -> dict:
+    """Map every folio of a manuscript to the stanzas that appear on it.
+
+    Args:
+        manuscript: SingleManuscript object
+
+    Returns:
+        Dict of folio id to ordered list of Stanza objects
+
+    Computes all folio/stanza overlaps in one broadcasted NumPy
+    comparison instead of calling get_stanzas_in_folio once per folio.
+    """
+    folios = list(
+        manuscript.folio_set.exclude(line_code_range_start__isnull=True).exclude(
+            line_code_range_end__isnull=True
         )
+    )
+    stanzas_by_folio = {folio.id: [] for folio in folios}
 
-        # A stanza is included if:
-        # 1. It starts within the folio range
-        # 2. It ends within the folio range
-        # 3. It spans across the folio range
-        if (
-            (
-                stanza_start
-                and stanza_start >= start_numeric
-                and stanza_start <= end_numeric
-            )
-            or (
-                stanza_end and stanza_end >= start_numeric and stanza_end <= end_numeric
-            )
-            or (
-                stanza_start
-                and stanza_end
-                and stanza_start <= start_numeric
-                and stanza_end >= end_numeric
-            )
-        ):
-            matching_stanzas.append(stanza)
+    stanzas = list(
+        Stanza.objects.exclude(start_numeric__isnull=True).order_by("start_numeric")
+    )
+    if not folios or not stanzas:
+        return stanzas_by_folio
 
-    return sorted(
-        matching_stanzas, key=lambda x: line_code_to_numeric(x.stanza_line_code_starts)
+    starts = np.array([s.start_numeric for s in stanzas], dtype=np.int32)
+    ends = np.array([s.end_numeric or s.start_numeric for s in stanzas], dtype=np.int32)
+    folio_starts = np.array(
+        [line_code_to_numeric(f.line_code_range_start) for f in folios],
+        dtype=np.int32,
+    )
+    folio_ends = np.array(
+        [line_code_to_numeric(f.line_code_range_end) for f in folios],
+        dtype=np.int32,
     )
 
+    # boolean overlap matrix (folios x stanzas) computed via
+    # broadcasting, in folio blocks so memory stays O(block x stanzas)
+    # instead of materializing the full matrix for large manuscripts
+    block_size = 256
+    for block_start in range(0, len(folios), block_size):
+        block_end = block_start + block_size
+        mask = (starts[None, :] <= folio_ends[block_start:block_end, None]) & (
+            ends[None, :] >= folio_starts[block_start:block_end, None]
+        )
+        for folio_idx, stanza_idx in zip(*np.nonzero(mask)):
+            stanzas_by_folio[folios[block_start + folio_idx].id].append(
+                stanzas[stanza_idx]
+            )
+
+    return stanzas_by_folio
+
 
 class LineCode(models.Model):
     code = models.CharField(
@@ -289,12 +367,13 @@ class TextDecoration(models.Model):
 class Detail(models.Model):
     """Details about the manuscript including author, scribe, headings, etc."""
 
-    STANZA_RUBRIC_CHOICES = (
-        ("sh", "Stanza Headings"),
-        ("mr", "Marginal Rubrics"),
-        ("ne", "Neither"),
-        ("uk", "Unknown"),
-    )
+    class StanzaRubric(models.TextChoices):
+        STANZA_HEADINGS = "sh", "Stanza Headings"
+        MARGINAL_RUBRICS = "mr", "Marginal Rubrics"
+        NEITHER = "ne", "Neither"
+        UNKNOWN = "uk", "Unknown"
+
+    STANZA_RUBRIC_CHOICES = StanzaRubric.choices
 
     id = models.AutoField(primary_key=True)
     manuscript = models.ForeignKey(
@@ -305,7 +384,7 @@ class Detail(models.Model):
     book_headings = RichTextField(blank=True, null=True)
     book_initials = RichTextField(blank=True, null=True)
     stanza_headings_marginal_rubrics = models.CharField(
-        max_length=2, choices=STANZA_RUBRIC_CHOICES, blank=True, null=True
+        max_length=2, choices=StanzaRubric.choices, blank=True, null=True
     )
     stanza_headings_marginal_rubrics_notes = RichTextField(
         max_length=510, blank=True, null=True
@@ -378,13 +457,43 @@ class AnnotatableMixin:
         """
         Combines the related annotation instances into a single list
         for templates.
+
+        The queryset feeding the template must prefetch_related
+        "editorial_notes", "cross_references" and "textual_variants":
+        .all() then reads the prefetch cache and iterating here costs no
+        queries. Without the prefetch every rendered object issues three.
         """
+        if not getattr(self, "_prefetched_objects_cache", None):
+            logger.warning(
+                "annotations accessed without prefetch_related on %s %s; "
+                "this issues three queries per rendered object",
+                type(self).__name__,
+                self.pk,
+            )
         return chain(
             self.editorial_notes.all(),
             self.cross_references.all(),
             self.textual_variants.all(),
         )
 
+    def paged_annotations(self, offset=0, limit=50):
+        """Return one page of annotations ordered by recency.
+
+        Pushes LIMIT into each of the three annotation queries and
+        merges the pre-sorted slices, so a heavily annotated stanza
+        never materializes every annotation to render one page.
+        """
+        upper = offset + limit
+        querysets = [
+            self.editorial_notes.order_by("-updated_at")[:upper],
+            self.cross_references.order_by("-updated_at")[:upper],
+            self.textual_variants.order_by("-updated_at")[:upper],
+        ]
+        merged = heapq.merge(
+            *querysets, key=lambda annotation: annotation.updated_at, reverse=True
+        )
+        return list(islice(merged, offset, upper))
+
 
 class RichTextMixin:
     """mixin for a save method to sanitize rich text fields for frontend display"""
@@ -397,15 +506,22 @@ class RichTextMixin:
         super().save(*args, **kwargs)
 
 
+class StanzaQuerySet(models.QuerySet):
+    def with_manuscript(self):
+        """Prefetch the folios and their manuscripts for list rendering."""
+        return self.prefetch_related("folios__manuscript")
+
+
 class Stanza(models.Model, AnnotatableMixin, RichTextMixin):
     """A stanza from the manuscript."""
 
-    STANZA_LANGUAGE = (
-        ("en", "English"),
-        ("it", "Italian"),
-        ("la", "Latin"),
-        ("fr", "French"),
-    )
+    class Language(models.TextChoices):
+        ENGLISH = "en", "English"
+        ITALIAN = "it", "Italian"
+        LATIN = "la", "Latin"
+        FRENCH = "fr", "French"
+
+    STANZA_LANGUAGE = Language.choices
 
     id = models.AutoField(primary_key=True)
     folios = models.ManyToManyField(
@@ -417,6 +533,7 @@ class Stanza(models.Model, AnnotatableMixin, RichTextMixin):
     stanza_line_code_starts = models.CharField(
         blank=True,
         null=True,
+        db_index=True,
         validators=[validate_line_number_code],
         max_length=20,
         help_text="Indicate where the folio begins. Input the text by book, stanza, and line number. For example: 01.01.01 refers to book 1, stanza 1, line 1.",
@@ -431,7 +548,7 @@ class Stanza(models.Model, AnnotatableMixin, RichTextMixin):
     stanza_text = RichTextField(blank=True, null=True)
     stanza_notes = RichTextField(blank=True, null=True)
     language = models.CharField(
-        max_length=2, choices=STANZA_LANGUAGE, blank=True, null=True
+        max_length=2, choices=Language.choices, blank=True, null=True
     )
     editorial_notes = GenericRelation(
         "textannotation.EditorialNote",
@@ -454,22 +571,42 @@ class Stanza(models.Model, AnnotatableMixin, RichTextMixin):
     is_rubric = models.BooleanField(
         default=False, help_text="Designates this stanza as a rubric/header."
     )
+    start_numeric = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Numeric BBSSLL value of the starting line code, maintained automatically for range queries.",
+    )
+    end_numeric = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        db_index=True,
+        editable=False,
+        help_text="Numeric BBSSLL value of the ending line code, maintained automatically for range queries.",
+    )
+
+    objects = StanzaQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        # keep the numeric columns in sync with the text codes so folio
+        # overlap queries can run as indexed range scans in the database
+        self.start_numeric = _line_code_numeric_or_none(self.stanza_line_code_starts)
+        self.end_numeric = (
+            _line_code_numeric_or_none(self.stanza_line_code_ends)
+            or self.start_numeric
+        )
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
-        if self.stanza_line_code_starts is not None:
-            return self.stanza_line_code_starts
-        elif self.stanza_line_code_ends is not None:
-            return self.stanza_line_code_starts + " - " + self.stanza_line_code_ends
-        elif self.stanza_line_variation is not None:
-            return (
-                self.stanza_line_code_starts
-                + " - "
-                + self.stanza_line_code_ends
-                + " - "
-                + self.stanza_line_variation
-            )
-        else:
-            return ""
+        start = self.stanza_line_code_starts or ""
+        end = self.stanza_line_code_ends
+        return f"{start} - {end}" if end else start
+
+    @cached_property
+    def unescaped_stanza_text(self):
+        # decoded on first template access and memoized per instance,
+        # so corpus views don't pay to unescape stanzas never rendered
+        return unescape(self.stanza_text or "")
 
     def get_book(self):
         return int(self.stanza_line_code.split(".")[0])
@@ -487,48 +624,81 @@ class Stanza(models.Model, AnnotatableMixin, RichTextMixin):
         return self.folio.manuscript if self.folio else None
 
     def derive_folio_location(self):
-        # We derive the folio based on the line code.
-        # if self.stanza_line_code_starts is not None:
-        #     line_code = self.stanza_line_code_starts
-        # elif self.stanza_line_code_ends is not None:
-        #     line_code = self.stanza_line_code_ends
-        # else:
-        #     return None
-        #
-        # book, stanza, line = line_code.split(".")
-        # return Folio.objects.filter(
-        #     manuscript=self.related_folio.manuscript, folio_number=book
-        # ).first()
-        start_book, start_stanza, start_line = map(int, start_line.split("."))
-        end_book, end_stanza, end_line = map(int, end_line.split("."))
-
-        for line in range(start_line, end_line + 1):
-            line_code = f"{start_book:02d}.{start_stanza:02d}.{line:02d}"
-            existing_stanzas = Stanza.objects.filter(
-                stanza_line_code_starts__startswith=line_code
-            )
-            variant_code = line_code + chr(ord("a") + existing_stanzas.count())
+        # We derive variant stanzas, one per line in this stanza's line
+        # code range, suffixing each code with the next free letter.
+        if not self.stanza_line_code_starts or not self.stanza_line_code_ends:
+            return
 
-            try:
-                self.stanza = Stanza.objects.get(stanza_line_code_starts=variant_code)
-            except ObjectDoesNotExist:
-                pass
+        start_book, start_stanza, start_line = parse_line_code(
+            self.stanza_line_code_starts
+        )
+        _, _, end_line = parse_line_code(self.stanza_line_code_ends)
+
+        # one grouped query for the existing variant counts of this
+        # book/stanza instead of a filter().count() per line
+        prefix = f"{start_book:02d}.{start_stanza:02d}."
+        counts = Counter(
+            code[:8]
+            for code in Stanza.objects.filter(
+                stanza_line_code_starts__startswith=prefix
+            ).values_list("stanza_line_code_starts", flat=True)
+        )
 
-            folio = Folio.objects.filter(
-                manuscript=self.related_folio.manuscript, folio_number=start_book
+        # the folio depends only on the constant start book, so resolve
+        # it once outside the loop
+        source_folio = next(iter(self.folios.all()), None)
+        folio = (
+            Folio.objects.filter(
+                manuscript=source_folio.manuscript, folio_number=start_book
             ).first()
+            if source_folio
+            else None
+        )
 
-            Stanza.objects.create(
-                folio=folio,
-                stanza_line_code_starts=variant_code,
-                stanza_line_code_end=variant_code,
-                stanza_text=self.stanza_text,
-                stanza_notes=self.stanza_notes,
-                language=self.language,
+        new_stanzas = []
+        for line in range(start_line, end_line + 1):
+            line_code = f"{prefix}{line:02d}"
+            variant_code = line_code + chr(ord("a") + counts[line_code])
+            counts[line_code] += 1
+
+            new_stanzas.append(
+                Stanza(
+                    stanza_line_code_starts=variant_code,
+                    stanza_line_code_ends=variant_code,
+                    stanza_text=self.stanza_text,
+                    stanza_notes=self.stanza_notes,
+                    language=self.language,
+                )
             )
 
+        # one multi-row INSERT instead of a round-trip per line
+        created = Stanza.objects.bulk_create(new_stanzas, batch_size=500)
+        if folio:
+            folio.stanzas.add(*created)
+
     class Meta:
         ordering = ("stanza_line_code_starts",)
+        indexes = [
+            # trigram index so substring searches on stanza text
+            # (admin search, annotation matching) avoid a full scan
+            GinIndex(
+                fields=["stanza_text"],
+                name="stanza_text_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            # composite index backing the folio overlap range query
+            models.Index(
+                fields=["start_numeric", "end_numeric"],
+                name="stanza_numeric_range",
+            ),
+            # partial index: rows without a line code carry no numeric
+            # value and never match the range filter, so keep them out
+            models.Index(
+                fields=["start_numeric"],
+                condition=models.Q(start_numeric__isnull=False),
+                name="stanza_startnum_partial",
+            ),
+        ]
 
 
 class StanzaTranslated(models.Model, AnnotatableMixin, RichTextMixin):
@@ -545,6 +715,7 @@ class StanzaTranslated(models.Model, AnnotatableMixin, RichTextMixin):
     stanza_line_code_starts = models.CharField(
         blank=True,
         null=True,
+        db_index=True,
         validators=[validate_line_number_code],
         max_length=20,
         help_text="Indicate where the stanza begins. Input the text by book, stanza, and line number. For example: 01.01.01 refers to book 1, stanza 1, line 1.",
@@ -558,7 +729,7 @@ class StanzaTranslated(models.Model, AnnotatableMixin, RichTextMixin):
     )
     stanza_text = RichTextField(blank=True, null=True)
     language = models.CharField(
-        max_length=2, choices=Stanza.STANZA_LANGUAGE, blank=True, null=True
+        max_length=2, choices=Stanza.Language.choices, blank=True, null=True
     )
     editorial_notes = GenericRelation(
         "textannotation.EditorialNote",
@@ -585,28 +756,53 @@ class StanzaTranslated(models.Model, AnnotatableMixin, RichTextMixin):
     def __str__(self) -> str:
         return str(self.stanza_text[:100])
 
+    @cached_property
+    def unescaped_stanza_text(self):
+        # decoded on first template access and memoized per instance,
+        # so corpus views don't pay to unescape stanzas never rendered
+        return unescape(self.stanza_text or "")
+
     class Meta:
         verbose_name = "Stanza translation"
         verbose_name_plural = "Stanza translations"
         ordering = ("stanza_line_code_starts",)
+        indexes = [
+            GinIndex(
+                fields=["stanza_text"],
+                name="stanzatrans_text_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
+
+class FolioQuerySet(models.QuerySet):
+    def with_manuscript(self):
+        """Join the manuscript and its library for list/str rendering.
+
+        Folio.__str__ formats the manuscript, so any page rendering
+        folios without this join issues one extra query per row.
+        """
+        return self.select_related("manuscript", "manuscript__library")
 
 
 class Folio(models.Model):
     """This provides a way to collect several stanzas onto a single page, and associate them with a single manuscript."""
 
-    FOLIO_MAP_CHOICES = (
-        ("yes", "Yes"),
-        ("yes_toponyms", "Yes with toponyms"),
-        ("yes_no_toponyms", "Yes without toponyms"),
-        ("no", "No"),
-    )
+    class FolioMap(models.TextChoices):
+        YES = "yes", "Yes"
+        YES_TOPONYMS = "yes_toponyms", "Yes with toponyms"
+        YES_NO_TOPONYMS = "yes_no_toponyms", "Yes without toponyms"
+        NO = "no", "No"
+
+    FOLIO_MAP_CHOICES = FolioMap.choices
 
     id = models.AutoField(primary_key=True)
-    folio_number = models.CharField(blank=True, null=True, max_length=510)
+    folio_number = models.CharField(blank=True, null=True, max_length=510, db_index=True)
     # TODO: Convert these ranges to a dropdown of available line codes
     line_code_range_start = models.CharField(
         blank=True,
         null=True,
+        db_index=True,
         max_length=100,
         help_text="Input the text by book, stanza, and line number. For example: 01.01.01 refers to book 1, stanza 1, line 1.",
         validators=[validate_line_number_code],
@@ -614,6 +810,7 @@ class Folio(models.Model):
     line_code_range_end = models.CharField(
         blank=True,
         null=True,
+        db_index=True,
         max_length=100,
         help_text="Input the text by book, stanza, and line number. For example: 01.01.01 refers to book 1, stanza 1, line 1.",
         validators=[validate_line_number_code],
@@ -636,7 +833,7 @@ class Folio(models.Model):
     folio_includes_map = models.CharField(
         blank=True,
         null=True,
-        choices=FOLIO_MAP_CHOICES,
+        choices=FolioMap.choices,
         verbose_name="Does the folio include a map?",
         max_length=510,
     )
@@ -647,6 +844,8 @@ class Folio(models.Model):
         verbose_name="Associated toponyms",
     )
 
+    objects = FolioQuerySet.as_manager()
+
     def __str__(self) -> str:
         if self.folio_number is not None:
             return f"Folio {self.folio_number}, from manuscript {self.manuscript}"
@@ -766,16 +965,33 @@ class AuthorityFile(models.Model):
         verbose_name_plural = "Authority Files"
 
 
+@lru_cache(maxsize=4096)
+def _toponym_url(slug, placename_id):
+    """Resolve a toponym URL once per (slug, placename_id) pair.
+
+    reverse() walks the URL resolver on every call; gazetteer pages call
+    get_absolute_url for every toponym on the map, so the resolution is
+    memoized for the life of the process (URLconfs only change on deploy).
+    """
+    if not slug:
+        return reverse("toponym_by_id", kwargs={"placename_id": placename_id})
+    return reverse("toponym_detail", kwargs={"toponym_slug": slug})
+
+
 class Location(models.Model):
     """Handle the location information and toponyms within a manuscript"""
 
-    CODE_CHOICE = (("mp", "Map"), ("pm", "Poem"))
+    class ToponymType(models.TextChoices):
+        MAP = "mp", "Map"
+        POEM = "pm", "Poem"
+
+    CODE_CHOICE = ToponymType.choices
 
     id = models.AutoField(primary_key=True)
     toponym_type = models.CharField(
         blank=True,
         null=True,
-        choices=CODE_CHOICE,
+        choices=ToponymType.choices,
         max_length=2,
         help_text="The type will be automatically set based off the placename ID.",
     )
@@ -807,11 +1023,30 @@ class Location(models.Model):
     )
     place_type = models.CharField(max_length=255, blank=True, null=True)
 
+    # placename ID prefix to toponym type, applied on save
+    _PREFIX_MAP = {"M": "mp", "P": "pm"}
+    _slug = models.SlugField(
+        max_length=255,
+        db_index=True,
+        blank=True,
+        editable=False,
+        help_text="Stored slug, maintained automatically from the name on save.",
+    )
+
     class Meta:
         verbose_name = "Toponym"
         verbose_name_plural = "Toponyms"
         ordering = ["placename_id"]
         unique_together = ["placename_id"]
+        indexes = [
+            # trigram index so the gazetteer's substring search on the
+            # toponym name avoids a full scan
+            GinIndex(
+                fields=["name"],
+                name="location_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.placename_id)
@@ -841,8 +1076,10 @@ class Location(models.Model):
 
                     location = geolocator.geocode(self.name, **europe_africa_bbox)
                     if location is not None:
-                        self.latitude = str(location.latitude)
-                        self.longitude = str(location.longitude)
+                        # assign the floats directly; stringifying into a
+                        # FloatField forces a parse on every read
+                        self.latitude = location.latitude
+                        self.longitude = location.longitude
                         self.save()
         except Exception as e:
             logger.warning("Warning in geocoding a toponym: %s %s", str(e), str(self))
@@ -850,16 +1087,19 @@ class Location(models.Model):
     def save(self, *args, **kwargs):
         # We attempt to automatically set the toponym type based on the code_id
         if self.placename_id:
-            prefix = self.placename_id[0].upper()
-            if prefix == "M":
-                self.toponym_type = "mp"
-            elif prefix == "P":
-                self.toponym_type = "pm"
+            self.toponym_type = self._PREFIX_MAP.get(
+                self.placename_id[0].upper(), self.toponym_type
+            )
+        # slugify once at write time so rendering links is a column read
+        self._slug = slugify(self.name or "") or slugify(self.placename_id or "")
         super(Location, self).save(*args, **kwargs)
 
     @property
     def slug(self):
         """Get the slug for this toponym, with fallback"""
+        if self._slug:
+            return self._slug
+        # unsaved instances and legacy rows compute on the fly
         if not self.name or not self.name.strip():
             # Fallback options if name is empty
             if self.placename_id:
@@ -870,11 +1110,7 @@ class Location(models.Model):
 
     def get_absolute_url(self):
         """Return the URL for this toponym using the slug with fallback"""
-        slug = self.slug
-        if not slug:
-            # If we still couldn't generate a slug, use the ID-based URL
-            return reverse("toponym_by_id", kwargs={"placename_id": self.placename_id})
-        return reverse("toponym_detail", kwargs={"toponym_slug": slug})
+        return _toponym_url(self.slug, self.placename_id)
 
 
 class LocationAlias(models.Model):
@@ -924,6 +1160,12 @@ class LocationAlias(models.Model):
         blank=True,
     )
     folios = models.ManyToManyField(Folio, blank=True)
+    display_name = models.CharField(
+        max_length=1024,
+        blank=True,
+        editable=False,
+        help_text="Denormalized label, maintained automatically on save.",
+    )
 
     class Meta:
         verbose_name = "Toponym Alias"
@@ -933,8 +1175,50 @@ class LocationAlias(models.Model):
             "location",
             "placename_alias",
         ]
+        indexes = [
+            # matches the per-location alias fetch with its default
+            # ordering, so Postgres serves it without a sort
+            models.Index(
+                fields=["location", "placename_standardized"],
+                name="la_loc_std_idx",
+            ),
+            # trigram indexes backing the gazetteer search's icontains
+            # lookups on the four searched placename columns
+            GinIndex(
+                fields=["placename_modern"],
+                name="la_modern_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["placename_ancient"],
+                name="la_ancient_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["placename_from_mss"],
+                name="la_from_mss_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["placename_alias"],
+                name="la_alias_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # build the label once at write time; __str__ runs per row in
+        # admin lists and dropdowns
+        self.display_name = (
+            f"{self.placename_from_mss} / {self.placename_standardized} "
+            f"/ {self.placename_modern} / {self.placename_alias}"
+        )
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
+        if self.display_name:
+            return self.display_name
+        # unsaved instances and legacy rows build the label on the fly
         return f"{self.placename_from_mss} / {self.placename_standardized} / {self.placename_modern} / {self.placename_alias}"
 
 
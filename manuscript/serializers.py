@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from manuscript.models import Location, LocationAlias, SingleManuscript
+from manuscript.models import Location, SingleManuscript
 
 
 class ToponymSerializer(serializers.ModelSerializer):
@@ -11,37 +11,25 @@ class ToponymSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "slug", "modern_country", "latitude", "longitude", "aliases"]
 
     def get_aliases(self, obj):
-        aliases = (
-            LocationAlias.objects.filter(location=obj)
-            .values(
-                "id",
-                "placename_from_mss",
-                "placename_standardized",
-                "placename_modern",
-                "placename_alias",
-                "placename_ancient",
-            )
-            .distinct()
-        )
-        return list(aliases)
+        # built from the viewset's locationalias_set prefetch cache, so
+        # listing N toponyms costs two queries instead of N + 1
+        return [
+            {
+                "id": alias.id,
+                "placename_from_mss": alias.placename_from_mss,
+                "placename_standardized": alias.placename_standardized,
+                "placename_modern": alias.placename_modern,
+                "placename_alias": alias.placename_alias,
+                "placename_ancient": alias.placename_ancient,
+            }
+            for alias in obj.locationalias_set.all()
+        ]
 
 
 class SingleManuscriptSerializer(serializers.ModelSerializer):
-    manuscript = serializers.SerializerMethodField()
+    # DRF resolves the storage URL (or null when blank) natively
+    photographs = serializers.FileField(read_only=True)
 
     class Meta:
         model = SingleManuscript
-        fields = ["id", "siglum", "iiif_url", "photographs", "manuscript"]
-
-    def get_manuscript(self, obj):
-        photographs = (
-            obj.photographs.url
-            if obj.photographs and hasattr(obj.photographs, "url")
-            else None
-        )
-        return {
-            "id": obj.id,
-            "siglum": obj.siglum,
-            "iiif_url": obj.iiif_url,
-            "photographs": photographs,
-        }
+        fields = ["id", "siglum", "iiif_url", "photographs"]
@@ -0,0 +1,16 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Cached manuscript dropdown for the stanza reader; cleared whenever a
+# manuscript or a textual variant changes, since the dropdown annotates
+# each manuscript with whether it has variants
+MANUSCRIPTS_DROPDOWN_CACHE_KEY = "manuscripts_dropdown_v1"
+
+
+@receiver(post_save, sender="manuscript.SingleManuscript")
+@receiver(post_delete, sender="manuscript.SingleManuscript")
+@receiver(post_save, sender="textannotation.TextualVariant")
+@receiver(post_delete, sender="textannotation.TextualVariant")
+def clear_manuscripts_dropdown(sender, **kwargs):
+    cache.delete(MANUSCRIPTS_DROPDOWN_CACHE_KEY)
@@ -1,29 +1,78 @@
 # templatetags/stanza_tags.py
+from bisect import bisect_left
+import hashlib
 import logging
+import re
 
-from bs4 import BeautifulSoup
+import ahocorasick
+from bs4 import BeautifulSoup, SoupStrainer
 from django import template
+from django.core.cache import cache
 from django.utils.safestring import mark_safe
 
 logger = logging.getLogger(__name__)
 register = template.Library()
 
+# Matches content that is entirely wrapped in a single outer <div>
+_WRAP_RE = re.compile(r"\A\s*<div\b[^>]*>(.*)</div>\s*\Z", re.DOTALL)
+# Restricts parsing to div elements when the regex can't do the job
+_DIV_STRAINER = SoupStrainer("div")
+
+# Span markup emitted around each annotated range
+_SPAN_FMT = (
+    '<span class="{cls}" '
+    'data-annotation-id="{aid}" '
+    'data-annotation-type="{atype}" '
+    'onclick="showAnnotation(event, this)">'
+    "{body}"
+    "</span>"
+)
+
+
+def _strip_outer_div(html_content):
+    """Return the content without its outer <div> wrapper, if any.
+
+    The common single-wrapper case is handled with a regex slice; only
+    markup with nested divs pays for an HTML parse, and that parse uses
+    lxml restricted to div elements.
+    """
+    match = _WRAP_RE.match(html_content)
+    if match:
+        inner = match.group(1)
+        if "<div" not in inner and "</div" not in inner:
+            return inner
+    soup = BeautifulSoup(html_content, "lxml", parse_only=_DIV_STRAINER)
+    return soup.div.decode_contents() if soup.div else html_content
+
 
 @register.filter
 def annotate_text(html_content, annotations):
     """
     Takes HTML content and list of annotations, returns HTML with annotated spans
     """
+    # materialize first: the annotations property hands us a chain
+    # object, which is always truthy and not reiterable
+    annotations = list(annotations)
+
     if not annotations:
         # Strip outer div tags but preserve inner HTML
-        soup = BeautifulSoup(html_content, "html.parser")
-        return mark_safe(soup.div.decode_contents() if soup.div else html_content)
-
-    # Parse the HTML
-    soup = BeautifulSoup(html_content, "html.parser")
+        return mark_safe(_strip_outer_div(html_content))
+
+    # The output is a pure function of the content and the annotation
+    # rows; keying on ids and update times makes edits miss naturally,
+    # so no signal-based invalidation is needed
+    key_source = "|".join(
+        [html_content]
+        + [f"{annotation.id}:{annotation.updated_at}" for annotation in annotations]
+    )
+    cache_key = "annotate_text:" + hashlib.md5(key_source.encode()).hexdigest()
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return mark_safe(cached)
 
-    # Get the inner content without the outer div
-    inner_html = soup.div.decode_contents() if soup.div else html_content
+    # Strip the outer div exactly once; template content is already
+    # str, so no encoding detection happens on the parse path
+    inner_html = _strip_outer_div(html_content)
 
     # Sort annotations by start position
     sorted_annotations = sorted(
@@ -35,23 +84,41 @@ def annotate_text(html_content, annotations):
         ),
     )
 
+    # One linear sweep collects every occurrence of every selected
+    # text, so the per-annotation lookup below is a bisect instead of a
+    # str.find rescan of the whole stanza
+    automaton = ahocorasick.Automaton()
+    for annotation in sorted_annotations:
+        if annotation.selected_text:
+            automaton.add_word(annotation.selected_text, annotation.selected_text)
+
+    starts_by_text = {}
+    if len(automaton) > 0:
+        automaton.make_automaton()
+        for end_idx, text in automaton.iter(inner_html):
+            starts_by_text.setdefault(text, []).append(end_idx - len(text) + 1)
+
     result = []
     last_pos = 0
 
     for annotation in sorted_annotations:
         # Find the actual text we're looking for
         target_text = annotation.selected_text
+        if not target_text:
+            continue
 
-        # Find where this text appears in the inner HTML
-        text_start = inner_html.find(target_text, last_pos)
+        # First occurrence at or after last_pos, as str.find would give
+        positions = starts_by_text.get(target_text, ())
+        position_idx = bisect_left(positions, last_pos)
+        text_start = positions[position_idx] if position_idx < len(positions) else -1
         if text_start != -1:
             # Add any content before the annotation
             if text_start > last_pos:
                 result.append(inner_html[last_pos:text_start])
 
-            # Add the annotated content
+            # The matched range equals the selected text by
+            # construction, so no slice of inner_html is needed
             text_end = text_start + len(target_text)
-            annotated_content = inner_html[text_start:text_end]
 
             # Determine the appropriate class based on annotation type
             annotation_type = annotation.annotation_type.lower()
@@ -60,12 +127,12 @@ def annotate_text(html_content, annotations):
             )
 
             result.append(
-                f'<span class="{css_class}" '
-                f'data-annotation-id="{annotation.id}" '
-                f'data-annotation-type="{annotation_type}" '
-                f'onclick="showAnnotation(event, this)">'
-                f"{annotated_content}"
-                f"</span>"
+                _SPAN_FMT.format(
+                    cls=css_class,
+                    aid=annotation.id,
+                    atype=annotation_type,
+                    body=target_text,
+                )
             )
 
             last_pos = text_end
@@ -74,7 +141,9 @@ def annotate_text(html_content, annotations):
     if last_pos < len(inner_html):
         result.append(inner_html[last_pos:])
 
-    return mark_safe("".join(result))
+    output = "".join(result)
+    cache.set(cache_key, output, 60 * 60)
+    return mark_safe(output)
 
 
 @register.filter
@@ -5,7 +5,6 @@ from . import views
 
 router = DefaultRouter()
 router.register(r"toponyms", views.ToponymViewSet, basename="toponyms")
-router.register(r"toponym-detail", views.ToponymViewSet, basename="toponym-detail")
 router.register(
     r"manuscript-detail", views.SingleManuscriptViewSet, basename="manuscript-detail"
 )
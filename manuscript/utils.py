@@ -17,14 +17,24 @@ def get_manifest():
     return response.json()
 
 
+@lru_cache(maxsize=1)
+def _canvas_label_index():
+    """Map canvas labels to canvas IDs, built once per process.
+
+    One pass over the manifest replaces a linear canvas scan per folio
+    lookup.
+    """
+    manifest = get_manifest()
+    return {
+        canvas["label"]: canvas["@id"]
+        for canvas in manifest["sequences"][0]["canvases"]
+    }
+
+
 def get_canvas_id_for_folio(folio_number):
     """Look up the canvas ID for a given folio number (e.g., "1r")"""
     try:
-        manifest = get_manifest()
-        for canvas in manifest["sequences"][0]["canvases"]:
-            if canvas["label"] == folio_number:
-                return canvas["@id"]
-        return None
+        return _canvas_label_index().get(folio_number)
     except Exception as e:
         print(f"Error fetching canvas ID for folio {folio_number}: {e}")
         return None
@@ -1,24 +1,44 @@
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from itertools import chain
 import logging
 import os
 import random
 from collections import defaultdict
-from html import unescape
+from operator import attrgetter
 
 from django.urls import reverse
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import TrigramSimilarity
 from django.contrib.staticfiles import finders
 from django.core.cache import cache
-from django.db.models import Exists, OuterRef, Q, Prefetch
+from django.core.paginator import Paginator
+from django.db.models import (
+    Case,
+    Exists,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast
 from django.http import HttpRequest, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.templatetags.static import static
+from django.utils.functional import SimpleLazyObject
 from django.utils.text import slugify
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import DetailView
 from rest_framework import viewsets
+from rest_framework.response import Response
 
 from gallery.models import GalleryIndexPage
 from manuscript.models import (
@@ -31,11 +51,33 @@ from manuscript.models import (
     line_code_to_numeric,
 )
 from manuscript.serializers import SingleManuscriptSerializer, ToponymSerializer
+from manuscript.signals import MANUSCRIPTS_DROPDOWN_CACHE_KEY
 from pages.models import AboutPage, SitePage
 from textannotation.models import CrossReference, EditorialNote, TextualVariant
 
 logger = logging.getLogger(__name__)
 
+# Pooled session for IIIF manifest fetches: keep-alive skips a fresh
+# TCP+TLS handshake on every cache miss, retries smooth over transient
+# upstream hiccups, and the timeout below keeps a slow host from
+# hanging a worker
+_HTTP = requests.Session()
+_HTTP.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.3),
+    ),
+)
+
+# Resolved on first use and shared across requests; get_for_model has
+# its own cache, but these skip the manager call on the hot paths
+_STANZA_CT = SimpleLazyObject(lambda: ContentType.objects.get_for_model(Stanza))
+_STANZA_TRANSLATED_CT = SimpleLazyObject(
+    lambda: ContentType.objects.get_for_model(StanzaTranslated)
+)
+
 
 def get_manifest_data(manifest_url):
     """Fetch and cache IIIF manifest data."""
@@ -46,7 +88,7 @@ def get_manifest_data(manifest_url):
         return cached_data
 
     # Fetch and cache for 24 hours if not in cache
-    response = requests.get(manifest_url)
+    response = _HTTP.get(manifest_url, timeout=(3, 10))
     response.raise_for_status()
     manifest_data = response.json()
     cache.set(cache_key, manifest_data, 60 * 60 * 24)
@@ -54,58 +96,101 @@ def get_manifest_data(manifest_url):
     return manifest_data
 
 
+def get_manifests_data(pairs):
+    """Fetch several (siglum, manifest_url) manifests at once.
+
+    Warm entries still come straight from the cache; cold URLs are
+    fetched concurrently so the page waits for the slowest manifest
+    rather than the sum of all of them.
+    """
+    if len(pairs) <= 1:
+        return {siglum: get_manifest_data(url) for siglum, url in pairs}
+    with ThreadPoolExecutor(max_workers=min(len(pairs), 8)) as executor:
+        manifests = executor.map(get_manifest_data, [url for _, url in pairs])
+        return {siglum: manifest for (siglum, _), manifest in zip(pairs, manifests)}
+
+
 def manuscript_stanzas(request, siglum):
     # Get the requested manuscript
     manuscript = get_object_or_404(SingleManuscript, siglum=siglum)
     logger.info(f"Loading manuscript_stanzas for {siglum}")
 
-    # Get all folios for this manuscript
-    folios = manuscript.folio_set.all().order_by("folio_number")
-    logger.info(f"Found {folios.count()} folios for manuscript {siglum}")
+    # Get all folios for this manuscript, materialized once: count(),
+    # exists(), and the mapping loop each issued their own query before
+    folios = list(
+        manuscript.folio_set.only(
+            "folio_number", "line_code_range_start", "line_code_range_end"
+        ).order_by("folio_number")
+    )
+    logger.info(f"Found {len(folios)} folios for manuscript {siglum}")
 
-    stanzas = Stanza.objects.exclude(stanza_line_code_starts__isnull=True)
+    # Ordered by line code so the grouping buckets fill pre-sorted
+    # (the zero-padded codes sort lexicographically in numeric order)
+    stanzas = Stanza.objects.exclude(stanza_line_code_starts__isnull=True).order_by(
+        "stanza_line_code_starts"
+    )
+
+    # Variants scoped to this manuscript, shared by both prefetches
+    # below. No join back to SingleManuscript: the render never reads
+    # variant.manuscript — it already has the manuscript in hand
+    manuscript_variants = TextualVariant.objects.filter(manuscript=manuscript)
 
     # Prefetch for efficiency
     stanzas = stanzas.prefetch_related(
         "folios",
         "editorial_notes",
         "cross_references",
-        Prefetch(
-            "textual_variants",
-            queryset=TextualVariant.objects.filter(
-                manuscript=manuscript
-            ).select_related("manuscript"),
-        ),
+        Prefetch("textual_variants", queryset=manuscript_variants),
     )
-    logger.info(f"Found {stanzas.count()} total stanzas")
-
-    # Get translated stanzas for all stanzas
-    translated_stanzas = StanzaTranslated.objects.filter(stanza__in=stanzas).distinct()
+    # Evaluate once: count() would issue a separate COUNT query and the
+    # filter below would re-run the stanza filter as a subquery
+    stanzas = list(stanzas)
+    logger.info(f"Found {len(stanzas)} total stanzas")
+
+    # Get translated stanzas for all stanzas. A plain IN over the pks
+    # needs no DISTINCT: filtering a foreign key against unique ids
+    # cannot duplicate rows, so Postgres skips the dedup sort
+    stanza_pks = [s.pk for s in stanzas]
+    translated_stanzas = StanzaTranslated.objects.filter(stanza__in=stanza_pks)
     translated_stanzas = translated_stanzas.prefetch_related(
         "editorial_notes",
         "cross_references",
-        Prefetch(
-            "textual_variants",
-            queryset=TextualVariant.objects.filter(
-                manuscript=manuscript
-            ).select_related("manuscript"),
-        ),
+        Prefetch("textual_variants", queryset=manuscript_variants),
     )
-    logger.info(f"Found {translated_stanzas.count()} translated stanzas")
+    translated_stanzas = list(translated_stanzas)
+    logger.info(f"Found {len(translated_stanzas)} translated stanzas")
+
+    # Index translations by their stanza FK once; the fallback branch
+    # below used to rescan every translated stanza per stanza group
+    translations_by_stanza_id = defaultdict(list)
+    for translated in translated_stanzas:
+        translations_by_stanza_id[translated.stanza_id].append(translated)
 
     # Process stanzas into books structure
     books = process_stanzas(stanzas)
     translated_books = process_stanzas(translated_stanzas, is_translated=True)
     logger.info(f"Processed stanzas into {len(books)} books")
 
+    # Flatten to one dict keyed by (book, stanza number): a single hash
+    # lookup per stanza instead of two chained .get() calls with a
+    # throwaway {} default each iteration
+    translated_by_key = {
+        (book, number): group
+        for book, inner in translated_books.items()
+        for number, group in inner.items()
+    }
+
     # Build paired books structure (will be sorted by book number)
     paired_books = {}
 
-    # Prepare folio mapping if we have folios
+    # Prepare folio mapping if we have folios. Stored as sorted
+    # (start, end, folio) intervals looked up with bisect: O(folios)
+    # memory instead of one dict entry per line code in every range
     has_folio_mapping = False
-    line_code_to_folio = {}
+    folio_intervals = []
+    interval_starts = []
 
-    if folios.exists():
+    if folios:
         # Try to build a map of line codes to folios
         for folio in folios:
             if folio.line_code_range_start and folio.line_code_range_end:
@@ -117,9 +202,7 @@ def manuscript_stanzas(request, siglum):
                     if start_code is None or end_code is None:
                         continue
 
-                    # Add codes to the map
-                    for code in range(start_code, end_code + 1):
-                        line_code_to_folio[code] = folio
+                    folio_intervals.append((start_code, end_code, folio))
 
                     has_folio_mapping = True
                     logger.info(
@@ -128,6 +211,13 @@ def manuscript_stanzas(request, siglum):
                 except Exception as e:
                     logger.warning(f"Error mapping folio {folio.folio_number}: {e}")
 
+        folio_intervals.sort(key=lambda interval: (interval[0], interval[1]))
+        interval_starts = [interval[0] for interval in folio_intervals]
+
+    # Folio associations discovered while pairing, written in one batch
+    # after the loops instead of one INSERT per stanza mid-render
+    pending_folio_links = []
+
     # Process each book
     for book_number, stanza_dict in books.items():
         paired_books[book_number] = []
@@ -140,29 +230,26 @@ def manuscript_stanzas(request, siglum):
             original_stanzas = stanza_dict[stanza_number]
 
             # Get corresponding translated stanzas
-            translated_stanza_group = translated_books.get(book_number, {}).get(
-                stanza_number, []
+            translated_stanza_group = translated_by_key.get(
+                (book_number, stanza_number), []
             )
 
             # If no translations found or this is Yale3 manuscript, use FK relationship instead
             if (not translated_stanza_group or siglum == "Yale3") and original_stanzas:
-                # Create a map of original stanza IDs
-                original_ids = [s.id for s in original_stanzas]
                 # Find translations directly linked to these stanzas
-                linked_translations = [
-                    ts for ts in translated_stanzas if ts.stanza_id in original_ids
-                ]
+                linked_translations = list(
+                    chain.from_iterable(
+                        translations_by_stanza_id.get(s.id, ())
+                        for s in original_stanzas
+                    )
+                )
                 if linked_translations:
-                    # Override the translations with the directly linked ones
+                    # Override the translations with the directly linked
+                    # ones; concatenated buckets need a re-sort, unlike
+                    # the pre-sorted groups from process_stanzas
+                    linked_translations.sort(key=attrgetter("_numeric"))
                     translated_stanza_group = linked_translations
 
-            # Ensure translations are always sorted by line code
-            if translated_stanza_group:
-                translated_stanza_group = sorted(
-                    translated_stanza_group,
-                    key=lambda s: line_code_to_numeric(s.stanza_line_code_starts),
-                )
-
             # Create the stanza group - we'll show all stanzas for now
             # This ensures manuscripts without folios still show stanzas
             stanza_group = {
@@ -175,11 +262,14 @@ def manuscript_stanzas(request, siglum):
                 first_stanza = original_stanzas[0]
                 if first_stanza.stanza_line_code_starts:
                     try:
-                        stanza_code = line_code_to_numeric(
-                            first_stanza.stanza_line_code_starts
-                        )
-                        if stanza_code in line_code_to_folio:
-                            matching_folio = line_code_to_folio[stanza_code]
+                        stanza_code = first_stanza._numeric
+                        # Rightmost interval starting at or before the code
+                        interval_idx = bisect_right(interval_starts, stanza_code) - 1
+                        if (
+                            interval_idx >= 0
+                            and stanza_code <= folio_intervals[interval_idx][1]
+                        ):
+                            matching_folio = folio_intervals[interval_idx][2]
 
                             # If this is a new folio, mark it in the stanza group
                             existing_folio_ids = {
@@ -195,7 +285,9 @@ def manuscript_stanzas(request, siglum):
 
                                 # Associate the stanza with this folio if not already done
                                 if matching_folio.id not in existing_folio_ids:
-                                    first_stanza.folios.add(matching_folio)
+                                    pending_folio_links.append(
+                                        (first_stanza.id, matching_folio.id)
+                                    )
                     except Exception as e:
                         logger.warning(
                             f"Error determining folio for stanza {first_stanza.id}: {e}"
@@ -204,15 +296,39 @@ def manuscript_stanzas(request, siglum):
             # Add the stanza group to the book
             paired_books[book_number].append(stanza_group)
 
-    # Get all manuscripts for the dropdown
-    manuscripts = (
-        SingleManuscript.objects.select_related("library")
-        .annotate(
-            has_variants=Exists(
-                TextualVariant.objects.filter(manuscript=OuterRef("pk"))
-            )
+    if pending_folio_links:
+        Stanza.folios.through.objects.bulk_create(
+            [
+                Stanza.folios.through(stanza_id=stanza_id, folio_id=folio_id)
+                for stanza_id, folio_id in pending_folio_links
+            ],
+            ignore_conflicts=True,
         )
-        .all()
+
+    # Get all manuscripts for the dropdown. The list is effectively
+    # static, so it is cached rather than re-running the correlated
+    # Exists subquery per manuscript on every stanza page; signals in
+    # manuscript.signals clear the key when the inputs change
+    manuscripts = cache.get_or_set(
+        MANUSCRIPTS_DROPDOWN_CACHE_KEY,
+        lambda: list(
+            SingleManuscript.objects.select_related("library")
+            # the dropdown renders siglum, iiif_url, and the library
+            # label via format_ms; skip the wide provenance columns
+            .only(
+                "id",
+                "siglum",
+                "iiif_url",
+                "shelfmark",
+                "library__city",
+                "library__library",
+            ).annotate(
+                has_variants=Exists(
+                    TextualVariant.objects.filter(manuscript=OuterRef("pk"))
+                )
+            )
+        ),
+        60 * 10,
     )
 
     # Count the total stanzas we're sending to the template
@@ -287,11 +403,17 @@ def create_annotation(request):
 
         # Get the appropriate model and object
         if model_type == "stanzatranslated":
-            content_type = ContentType.objects.get_for_model(StanzaTranslated)
-            get_object_or_404(StanzaTranslated, id=object_id)
+            content_type = _STANZA_TRANSLATED_CT
+            target_model = StanzaTranslated
         else:
-            content_type = ContentType.objects.get_for_model(Stanza)
-            get_object_or_404(Stanza, id=object_id)
+            content_type = _STANZA_CT
+            target_model = Stanza
+
+        # Only existence matters here; don't pull the full stanza row
+        if not target_model.objects.filter(id=object_id).exists():
+            return JsonResponse(
+                {"success": False, "error": "Stanza not found"}, status=404
+            )
 
         try:
             from_pos = int(request.POST.get("from_pos", 0))
@@ -356,26 +478,21 @@ def create_annotation(request):
 def get_annotations(request, stanza_id):
     try:
         stanza = Stanza.objects.get(id=stanza_id)
-        notes = stanza.editorial_notes.all()
-        refs = stanza.cross_references.all()
-        variants = stanza.textual_variants.all()
-
-        annotations = chain(notes, refs, variants)
 
-        return JsonResponse(
-            [
-                {
-                    "id": ann.id,
-                    "selected_text": ann.selected_text,
-                    "annotation": ann.annotation,
-                    "annotation_type": ann.annotation_type,
-                    "from_pos": ann.from_pos,
-                    "to_pos": ann.to_pos,
-                }
-                for ann in annotations
-            ],
-            safe=False,
+        # values() rows feed the JSON response directly — no model
+        # instances are built just to read their attributes back out
+        fields = ("id", "selected_text", "annotation", "from_pos", "to_pos")
+        notes = stanza.editorial_notes.values(*fields).annotate(
+            annotation_type=Value("note")
         )
+        refs = stanza.cross_references.values(*fields).annotate(
+            annotation_type=Value("reference")
+        )
+        variants = stanza.textual_variants.values(*fields).annotate(
+            annotation_type=Value("variant")
+        )
+
+        return JsonResponse(list(chain(notes, refs, variants)), safe=False)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
@@ -415,23 +532,42 @@ def get_annotation(request, annotation_type, annotation_id):
 def process_stanzas(stanzas, is_translated=False):
     books = defaultdict(lambda: defaultdict(list))
     for stanza in stanzas:
-        book_number = int(stanza.stanza_line_code_starts.split(".")[0])
-        stanza_number = int(stanza.stanza_line_code_starts.split(".")[1])
+        code = stanza.stanza_line_code_starts
+        parts = code.split(".", 2)
+        book_number = int(parts[0])
+        stanza_number = int(parts[1])
 
-        if is_translated:
-            stanza.unescaped_stanza_text = unescape(stanza.stanza_text)
-        else:
-            stanza.unescaped_stanza_text = unescape(stanza.stanza_text)
+        # Parse the line code once per stanza; every later sort and folio
+        # lookup reads the attribute instead of re-parsing
+        stanza._numeric = line_code_to_numeric(code)
 
         books[book_number][stanza_number].append(stanza)
 
-        # Sort stanzas within each stanza number by line code for proper ordering
-        books[book_number][stanza_number].sort(
-            key=lambda s: line_code_to_numeric(s.stanza_line_code_starts)
-        )
+    # No per-bucket sort: both callers order their querysets by
+    # stanza_line_code_starts, and the zero-padded codes sort
+    # lexicographically in numeric order, so buckets fill pre-sorted
 
-    # Return books with keys sorted by book number
-    return {k: dict(v) for k, v in sorted(books.items())}
+    # Return books with keys sorted by book number; the inner
+    # defaultdicts are read-only from here, so no per-book dict copy
+    return dict(sorted(books.items()))
+
+
+@lru_cache(maxsize=1)
+def _home_image_urls():
+    """List the homepage image directory once per process.
+
+    Static files only change on deploy, which restarts the process and
+    clears the cache, so the per-request directory listing is avoided.
+    """
+    image_directory = "images/home/"
+    static_dir = finders.find(image_directory)
+    if not static_dir or not os.path.exists(static_dir):
+        return ()
+    return tuple(
+        static(f"images/home/{f}")
+        for f in os.listdir(static_dir)
+        if os.path.isfile(os.path.join(static_dir, f))
+    )
 
 
 def index(request: HttpRequest):
@@ -439,20 +575,8 @@ def index(request: HttpRequest):
 
     intro = HomeIntroduction.objects.first()
 
-    # Prefetch image URLs
-    image_directory = "images/home/"
-    image_urls = []
-    static_dir = finders.find(image_directory)
-    if static_dir and os.path.exists(static_dir):
-        images = [
-            f
-            for f in os.listdir(static_dir)
-            if os.path.isfile(os.path.join(static_dir, f))
-        ]
-        for image in images:
-            image_urls.append(static(f"images/home/{image}"))
-
-    # Shuffle the image URLs to simulate randomness
+    # Shuffle a copy of the cached URLs to simulate randomness
+    image_urls = list(_home_image_urls())
     random.shuffle(image_urls)
 
     # get wagtail urls programmatically
@@ -536,6 +660,9 @@ def stanzas(request: HttpRequest):
     folios = Folio.objects.all()
     stanzas = (
         Stanza.objects.prefetch_related(
+            # ordered in the prefetch so the folio checks below read the
+            # cache directly instead of querying and sorting per group
+            Prefetch("folios", queryset=Folio.objects.order_by("folio_number")),
             "editorial_notes",
             "cross_references",
             Prefetch(
@@ -559,12 +686,22 @@ def stanzas(request: HttpRequest):
         .all()
         .order_by("stanza_line_code_starts")
     )
-    manuscripts = SingleManuscript.objects.all()
+    # the dropdown reads siglum, iiif_url, and the library label; the
+    # join also keeps format_ms from querying per manuscript
+    manuscripts = SingleManuscript.objects.select_related("library").only(
+        "id", "siglum", "iiif_url", "shelfmark", "library__city", "library__library"
+    )
     default_manuscript = SingleManuscript.objects.get(siglum="Urb1")
 
     books = process_stanzas(stanzas)
     translated_books = process_stanzas(translated_stanzas)
 
+    # Index translations by their stanza FK once; the fallback branch
+    # below used to rescan every translated stanza per stanza group
+    translations_by_stanza_id = defaultdict(list)
+    for translated in translated_stanzas:
+        translations_by_stanza_id[translated.stanza_id].append(translated)
+
     # Group stanzas by folio within each book
     paired_books = {}
     for book_number, stanza_dict in sorted(books.items()):  # Sort by book number
@@ -579,20 +716,18 @@ def stanzas(request: HttpRequest):
 
             # If we can't find translations by line code, try using the FK relationship
             if not translated_stanza_group and original_stanzas:
-                original_ids = [s.id for s in original_stanzas]
-                linked_translations = [
-                    ts for ts in translated_stanzas if ts.stanza_id in original_ids
-                ]
+                linked_translations = list(
+                    chain.from_iterable(
+                        translations_by_stanza_id.get(s.id, ())
+                        for s in original_stanzas
+                    )
+                )
                 if linked_translations:
+                    # concatenated buckets need a re-sort, unlike the
+                    # pre-sorted groups from process_stanzas
+                    linked_translations.sort(key=attrgetter("_numeric"))
                     translated_stanza_group = linked_translations
 
-            # Ensure translations are always sorted by line code
-            if translated_stanza_group:
-                translated_stanza_group = sorted(
-                    translated_stanza_group,
-                    key=lambda s: line_code_to_numeric(s.stanza_line_code_starts),
-                )
-
             # Add folio information
             stanza_group = {
                 "original": original_stanzas,
@@ -601,10 +736,8 @@ def stanzas(request: HttpRequest):
 
             # Check if this is a new folio by looking at the first stanza's folios
             if original_stanzas:
-                # Get the first stanza's folios ordered by folio_number
-                stanza_folios = sorted(
-                    original_stanzas[0].folios.all(), key=lambda f: f.folio_number
-                )
+                # Already ordered by folio_number via the prefetch
+                stanza_folios = list(original_stanzas[0].folios.all())
 
                 # If the stanza has any folios and the current folio has changed
                 if stanza_folios and (
@@ -622,13 +755,9 @@ def stanzas(request: HttpRequest):
 
             paired_books[book_number].append(stanza_group)
 
-    manuscript_data = {
-        "iiif_url": (
-            default_manuscript.iiif_url
-            if hasattr(default_manuscript, "iiif_url")
-            else None
-        )
-    }
+    # iiif_url is a declared field, so it is always present; blank
+    # values normalize to None as before
+    manuscript_data = {"iiif_url": default_manuscript.iiif_url or None}
 
     return render(
         request,
@@ -685,74 +814,73 @@ def manuscripts(request: HttpRequest):
     folios = Folio.objects.all()
     stanzas = (
         Stanza.objects.prefetch_related(
-            "folios", "editorial_notes", "cross_references", "textual_variants"
+            # ordered in the prefetch so the folio checks below read the
+            # cache directly instead of querying and sorting per group
+            Prefetch("folios", queryset=Folio.objects.order_by("folio_number")),
+            "editorial_notes",
+            "cross_references",
+            "textual_variants",
         )
         .all()
         .order_by("stanza_line_code_starts")
     )
 
     # Remove the translated stanzas
-    manuscripts = SingleManuscript.objects.all()
+    manuscripts = SingleManuscript.objects.select_related("library").only(
+        "id", "siglum", "iiif_url", "shelfmark", "library__city", "library__library"
+    )
     default_manuscript = SingleManuscript.objects.get(siglum="Urb1")
 
-    # Process stanzas into books structure (same as in stanzas view)
-    books = defaultdict(lambda: defaultdict(list))
-    for stanza in stanzas:
-        if stanza.stanza_line_code_starts:
-            parts = stanza.stanza_line_code_starts.split(".")
-            if len(parts) >= 2:
-                book_number = int(parts[0])
-                stanza_number = int(parts[1])
-
-                # Process text for display
-                if hasattr(stanza, "stanza_text"):
-                    stanza.unescaped_stanza_text = unescape(stanza.stanza_text)
-
-                books[book_number][stanza_number].append(stanza)
-
-    # Group stanzas by book and track folios - using same approach as stanzas view
+    # Single pass: the queryset is ordered by line code, so stanza
+    # groups arrive consecutively and already in (book, stanza) order —
+    # no intermediate books structure or second traversal needed
     paired_books = {}
-    for book_number, stanza_dict in sorted(books.items()):  # Sort by book number
-        paired_books[book_number] = []
-        current_folio = None
+    current_folio = None
+    current_key = None
+    stanza_pair = None
 
-        # Sort stanza numbers to ensure correct order
-        stanza_numbers = sorted(stanza_dict.keys())
+    for stanza in stanzas:
+        code = stanza.stanza_line_code_starts
+        if not code:
+            continue
+        parts = code.split(".", 2)
+        if len(parts) < 2:
+            continue
+        book_number = int(parts[0])
+        stanza_number = int(parts[1])
+
+        key = (book_number, stanza_number)
+        if key == current_key:
+            stanza_pair["original"].append(stanza)
+            continue
+        current_key = key
+
+        if book_number not in paired_books:
+            paired_books[book_number] = []
+            current_folio = None  # folio tracking restarts per book
+
+        # Create a stanza pair dictionary with just original stanzas
+        stanza_pair = {
+            "original": [stanza],
+            "new_folio": False,
+        }
 
-        for stanza_number in stanza_numbers:
-            original_stanzas = stanza_dict[stanza_number]
+        # Check if this is a new folio by looking at the group-opening
+        # stanza's folios, already ordered by folio_number via the prefetch
+        stanza_folios = list(stanza.folios.all())
+        if stanza_folios and (
+            current_folio is None or stanza_folios[0] != current_folio
+        ):
+            current_folio = stanza_folios[0]
+            stanza_pair["new_folio"] = True
+            # Add information about all folios this stanza appears on
+            stanza_pair["folios"] = [f.folio_number for f in stanza_folios]
 
-            # Create a stanza pair dictionary with just original stanzas
-            stanza_pair = {
-                "original": original_stanzas,
-                "new_folio": False,
-            }
+        paired_books[book_number].append(stanza_pair)
 
-            # Check if this is a new folio by looking at the first stanza's folios
-            if original_stanzas:
-                # Get the first stanza's folios ordered by folio_number
-                stanza_folios = sorted(
-                    original_stanzas[0].folios.all(), key=lambda f: f.folio_number
-                )
-
-                # If the stanza has any folios and the current folio has changed
-                if stanza_folios and (
-                    current_folio is None or stanza_folios[0] != current_folio
-                ):
-                    current_folio = stanza_folios[0]
-                    stanza_pair["new_folio"] = True
-                    # Add information about all folios this stanza appears on
-                    stanza_pair["folios"] = [f.folio_number for f in stanza_folios]
-
-            paired_books[book_number].append(stanza_pair)
-
-    manuscript_data = {
-        "iiif_url": (
-            default_manuscript.iiif_url
-            if hasattr(default_manuscript, "iiif_url")
-            else None
-        )
-    }
+    # iiif_url is a declared field, so it is always present; blank
+    # values normalize to None as before
+    manuscript_data = {"iiif_url": default_manuscript.iiif_url or None}
 
     return render(
         request,
@@ -775,42 +903,46 @@ def manuscript(request: HttpRequest, siglum: str):
         siglum=siglum,
     )
 
-    # Get folios and create custom sort
-    def folio_sort_key(folio):
-        # Extract number and suffix from folio_number
-        # Handle potential missing or malformed folio numbers
-        if not folio.folio_number:
-            return (float("inf"), "z")  # Put empty/null values at the end
-
-        # Find the number part
-        import re
-
-        number_match = re.match(r"(\d+)", folio.folio_number)
-        if not number_match:
-            return (float("inf"), "z")
-
-        number = int(number_match.group(1))
-
-        # Get the suffix (r or v), default to 'z' if neither
-        suffix = folio.folio_number[-1].lower()
-        # Make 'v' sort before 'r' by converting to sorting value
-        suffix_val = {"v": "a", "r": "b"}.get(suffix, "z")
-
-        return (number, suffix_val)
-
-    # Get folios and sort them
-    folios = sorted(get_manuscript.folio_set.all(), key=folio_sort_key)
+    # Get folios sorted in the database: leading number first (folios
+    # without one sort last), verso before recto. One prefetch replaces
+    # the per-folio alias query (and its per-location re-filter) below
+    folios = (
+        get_manuscript.folio_set.prefetch_related(
+            Prefetch(
+                "locationalias_set",
+                queryset=LocationAlias.objects.select_related("location"),
+            )
+        )
+        .annotate(
+            _folio_num=Cast(
+                Func(F("folio_number"), Value(r"^\d+"), function="substring"),
+                IntegerField(),
+            ),
+            _folio_side=Case(
+                When(folio_number__iendswith="v", then=Value(0)),
+                When(folio_number__iendswith="r", then=Value(1)),
+                default=Value(2),
+                output_field=IntegerField(),
+            ),
+        )
+        .order_by(F("_folio_num").asc(nulls_last=True), "_folio_side")
+    )
 
     # Rest of your existing code for handling locations...
     for folio in folios:
-        location_aliases = LocationAlias.objects.filter(folios=folio).select_related(
-            "location"
-        )
+        location_aliases = list(folio.locationalias_set.all())
         locations = {alias.location for alias in location_aliases}
 
+        # First alias per location under the default
+        # placename_standardized ordering — what .first() used to
+        # return — built once instead of rescanning per location
+        primary_aliases = {}
+        for alias in location_aliases:
+            primary_aliases.setdefault(alias.location_id, alias)
+
         folio.related_locations = []
         for location in locations:
-            primary_alias = location_aliases.filter(location=location).first()
+            primary_alias = primary_aliases[location.id if location else None]
             display_name = (
                 primary_alias.placename_modern
                 or primary_alias.placename_from_mss
@@ -849,37 +981,40 @@ def get_toponym_slug(toponym_name):
 
 def toponym_by_slug(request: HttpRequest, toponym_slug: str):
     """View a toponym by its slugified name"""
-    # Try to find the toponym based on slugified name
-    location = None
+    # The stored slug is indexed and maintained in Location.save(), so
+    # the common case is one lookup instead of slugifying every row
+    location = Location.objects.filter(_slug=toponym_slug).first()
 
-    # First try to find by name
-    locations = Location.objects.all()
-    for loc in locations:
-        if slugify(loc.name) == toponym_slug:
-            location = loc
-            break
-
-    # If not found by name, check aliases
+    # If not found by name, check aliases. slugify() is not invertible
+    # in SQL, so this still scans — but over narrow value tuples rather
+    # than full model instances
     if location is None:
-        aliases = LocationAlias.objects.all()
-        for alias in aliases:
-            # Check all the possible name fields
-            name_fields = [
-                alias.placename_from_mss,
-                alias.placename_standardized,
-                alias.placename_modern,
-                alias.placename_alias,
-                alias.placename_ancient,
-            ]
-
-            for name in name_fields:
-                if name and slugify(name) == toponym_slug:
-                    location = alias.location
-                    break
-
-            if location:
+        alias_rows = LocationAlias.objects.exclude(location__isnull=True).values_list(
+            "location_id",
+            "placename_from_mss",
+            "placename_standardized",
+            "placename_modern",
+            "placename_alias",
+            "placename_ancient",
+        )
+        for row in alias_rows.iterator(chunk_size=500):
+            if any(name and slugify(name) == toponym_slug for name in row[1:]):
+                location = Location.objects.get(pk=row[0])
                 break
 
+    if location is None:
+        # Last resort before a 404: a close-match lookup catches minor
+        # slug misspellings in shared links, served by the trigram
+        # index on the name column
+        location = (
+            Location.objects.annotate(
+                similarity=TrigramSimilarity("name", toponym_slug.replace("-", " "))
+            )
+            .filter(similarity__gt=0.6)
+            .order_by("-similarity")
+            .first()
+        )
+
     if location is None:
         # If still not found, return 404
         from django.http import Http404
@@ -893,17 +1028,26 @@ def toponym_by_slug(request: HttpRequest, toponym_slug: str):
 def toponyms(request: HttpRequest):
     """View for displaying all toponyms with proper slugs"""
     # Get unique and sorted Location objects
+    # The index partial only renders name and slug link; skip loading
+    # the coordinate/description columns for every row
     toponym_objects = (
         Location.objects.exclude(placename_id__isnull=True)
         .exclude(placename_id="")
         .exclude(name__isnull=True)
         .exclude(name="")
+        .only("id", "name", "placename_id", "_slug")
         .order_by("name")
         .distinct("name", "placename_id")
     )
 
+    # Render the index list a page at a time; the map markers come from
+    # the toponym API and are unaffected
+    page_obj = Paginator(toponym_objects, 200).get_page(request.GET.get("page"))
+
     return render(
-        request, "gazetteer/gazetteer_index.html", {"locations": toponym_objects}
+        request,
+        "gazetteer/gazetteer_index.html",
+        {"locations": page_obj, "page_obj": page_obj},
     )
 
 
@@ -915,20 +1059,26 @@ def toponym(request: HttpRequest, placename_id: str):
     filtered_folios = filtered_toponym.folio_set.all()
     filtered_linecodes = filtered_toponym.line_codes.all()
 
-    manuscripts_with_iiif = filtered_manuscripts.exclude(
-        Q(iiif_url__isnull=True) | Q(iiif_url="")
-    ).values_list("siglum", "iiif_url")
+    # Evaluated once and reused for both the url dict and the manifests
+    manuscripts_with_iiif = list(
+        filtered_manuscripts.exclude(
+            Q(iiif_url__isnull=True) | Q(iiif_url="")
+        ).values_list("siglum", "iiif_url")
+    )
 
     iiif_urls = dict(manuscripts_with_iiif)
 
-    iiif_manifest = {
-        siglum: get_manifest_data(url) for siglum, url in manuscripts_with_iiif
-    }
+    iiif_manifest = get_manifests_data(manuscripts_with_iiif)
 
-    # First get aliases with related data
-    aliases = filtered_toponym.locationalias_set.all().prefetch_related(
-        "manuscripts", "folios"
-    )
+    # First get aliases with related data; only the placename columns
+    # are read below, so skip loading the rest of each row
+    aliases = filtered_toponym.locationalias_set.only(
+        "placename_alias",
+        "placename_modern",
+        "placename_standardized",
+        "placename_from_mss",
+        "placename_ancient",
+    ).prefetch_related("manuscripts", "folios")
 
     # Then process aggregations
     aggregated_aliases = {
@@ -966,16 +1116,6 @@ def toponym(request: HttpRequest, placename_id: str):
                 name.strip() for name in alias.placename_ancient.split(",")
             )
 
-    # After aliases are processed, then handle IIIF URLs and manifests
-    manuscripts_with_iiif = filtered_manuscripts.exclude(
-        Q(iiif_url__isnull=True) | Q(iiif_url="")
-    ).values_list("siglum", "iiif_url")
-
-    iiif_urls = dict(manuscripts_with_iiif)
-    iiif_manifest = {
-        siglum: get_manifest_data(url) for siglum, url in manuscripts_with_iiif
-    }
-
     # Process line codes
     line_codes = [{"line_code": lc.code} for lc in filtered_linecodes]
 
@@ -1024,12 +1164,69 @@ class ToponymViewSet(viewsets.ReadOnlyModelViewSet):
         Optionally filters the queryset based on the 'q' query parameter
         and returns all objects if no specific filter is applied.
         """
-        queryset = Location.objects.all()
+        # prefetch the aliases so serialization reads a per-object cache
+        # instead of querying once per toponym
+        queryset = Location.objects.prefetch_related("locationalias_set")
         query = self.request.query_params.get("q", None)
         if query is not None:
             queryset = queryset.filter(country__icontains=query)
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        # read-only list path: two values() queries and plain dicts,
+        # skipping the per-field serializer machinery entirely; the
+        # ModelSerializer still handles the detail route
+        queryset = Location.objects.all()
+        query = request.query_params.get("q", None)
+        if query is not None:
+            queryset = queryset.filter(country__icontains=query)
+
+        locations = list(
+            queryset.values(
+                "id",
+                "name",
+                "modern_country",
+                "latitude",
+                "longitude",
+                "placename_id",
+                "_slug",
+            )
+        )
+
+        aliases_by_location = defaultdict(list)
+        alias_rows = LocationAlias.objects.filter(
+            location_id__in=[location["id"] for location in locations]
+        ).values(
+            "id",
+            "location_id",
+            "placename_from_mss",
+            "placename_standardized",
+            "placename_modern",
+            "placename_alias",
+            "placename_ancient",
+        )
+        # iterate the server cursor directly instead of materializing the
+        # full alias result set twice (queryset cache plus the buckets)
+        for row in alias_rows.iterator(chunk_size=200):
+            aliases_by_location[row.pop("location_id")].append(row)
+
+        for location in locations:
+            slug = location.pop("_slug")
+            placename_id = location.pop("placename_id")
+            if not slug:
+                # same fallback chain as the Location.slug property
+                name = location["name"]
+                if name and name.strip():
+                    slug = slugify(name)
+                elif placename_id:
+                    slug = slugify(placename_id)
+                else:
+                    slug = f"toponym-{location['id']}"
+            location["slug"] = slug
+            location["aliases"] = aliases_by_location.get(location["id"], [])
+
+        return Response(locations)
+
 
 class SingleManuscriptViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = SingleManuscriptSerializer
@@ -1040,7 +1237,11 @@ class SingleManuscriptViewSet(viewsets.ReadOnlyModelViewSet):
         Optionally filters the queryset based on the 'q' query parameter
         and returns all objects if no specific filter is applied.
         """
-        queryset = SingleManuscript.objects.all()
+        # the serializer only reads these four columns; skip loading the
+        # provenance rich text and the other wide fields per row
+        queryset = SingleManuscript.objects.only(
+            "id", "siglum", "iiif_url", "photographs"
+        )
         query = self.request.query_params.get("q", None)
         if query is not None:
             queryset = queryset.filter(siglum__icontains=query)
@@ -24,6 +24,20 @@ document.addEventListener("DOMContentLoaded", function() {
                 }
             }
         });
+
+        // Unwrap a single outer <div> client-side before POST so the
+        // server usually never needs to parse the HTML at all
+        // (StripDivMixin stays as a defensive fallback).
+        form.addEventListener('submit', function () {
+            const value = stanzaTextInput.value;
+            if (/^\s*<div[^>]*>[\s\S]*<\/div>\s*$/.test(value)) {
+                const d = document.createElement('div');
+                d.innerHTML = value;
+                if (d.children.length === 1 && d.firstElementChild.tagName === 'DIV') {
+                    stanzaTextInput.value = d.firstElementChild.innerHTML.trim();
+                }
+            }
+        });
     }
 
     // Initialize the annotation system only after Trix is ready
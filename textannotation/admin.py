@@ -1,13 +1,16 @@
+from functools import lru_cache
+
 from django import forms
 from django.contrib import admin
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils.html import format_html
 from import_export.admin import ImportExportModelAdmin
 
 from common.admin import StripDivMixin
-from manuscript.models import SingleManuscript
+from manuscript.models import SingleManuscript, Stanza, StanzaTranslated
 from textannotation.models import (
     CrossReference,
     EditorialNote,
@@ -16,6 +19,17 @@ from textannotation.models import (
 from textannotation.resources import TextualVariantResource
 
 
+@lru_cache(maxsize=None)
+def _annotated_type_label(content_type_id):
+    """Column label for a content type, computed once per type.
+
+    The title-cased verbose name is static for the process lifetime,
+    so list views don't re-derive it for every row.
+    """
+    model = ContentType.objects.get_for_id(content_type_id).model_class()
+    return model._meta.verbose_name.title() if model else ""
+
+
 class AnnotatedContentTypeFilter(admin.SimpleListFilter):
     """Sidebar filter for annotations by annotated content type"""
 
@@ -32,7 +46,7 @@ class AnnotatedContentTypeFilter(admin.SimpleListFilter):
 
         # list filters require tuples like (id, label)
         return [
-            (ct.id, ct.model_class()._meta.verbose_name.title())
+            (ct.id, _annotated_type_label(ct.id))
             for ct in content_types
             if ct.model_class()
         ]
@@ -65,7 +79,7 @@ class BaseAnnotationAdminMixin:
     @admin.display(ordering="content_type")
     def annotated_type(self, obj):
         # Label for content type column, for display and sorting
-        return obj.content_type.model_class()._meta.verbose_name.title()
+        return _annotated_type_label(obj.content_type_id)
 
     @admin.display(description="Line code", ordering="line_code")
     def line_code_display(self, obj):
@@ -73,7 +87,7 @@ class BaseAnnotationAdminMixin:
         views for annotations, if available"""
         target = obj.content_object
 
-        if target and hasattr(target, "stanza_line_code_starts"):
+        if isinstance(target, (Stanza, StanzaTranslated)):
             # generate a link to the change view for the stanza/stanzatranslated
             app_label = target._meta.app_label
             model_name = target._meta.model_name
@@ -90,7 +104,19 @@ class BaseAnnotationAdminMixin:
             super()
             .get_queryset(request)
             .select_related("content_type")
-            .prefetch_related("content_object")
+            .prefetch_related(
+                # only annotatable targets exist; fetch just the columns
+                # line_code_display reads instead of whole stanza rows
+                GenericPrefetch(
+                    "content_object",
+                    [
+                        Stanza.objects.only("id", "stanza_line_code_starts"),
+                        StanzaTranslated.objects.only(
+                            "id", "stanza_line_code_starts"
+                        ),
+                    ],
+                )
+            )
             .annotate(
                 # annotate with line code from stanza or stanzatranslated, for
                 # combined sorting
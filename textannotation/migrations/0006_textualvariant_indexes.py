@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-08-29 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("textannotation", "0005_alter_textualvariant_notes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="textualvariant",
+            index=models.Index(
+                fields=["content_type", "object_id"], name="tv_ct_obj_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="textualvariant",
+            index=models.Index(
+                fields=["manuscript", "content_type", "object_id"],
+                name="tv_ms_ct_obj_idx",
+            ),
+        ),
+    ]
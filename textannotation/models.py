@@ -3,6 +3,7 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.template.defaultfilters import truncatechars
+from django.utils.functional import cached_property
 from django.utils.html import strip_tags
 
 from html import unescape
@@ -16,6 +17,9 @@ class BaseAnnotation(models.Model):
     selections within a ProseField.
     All annotations belong to one of the subtype classes."""
 
+    # shorthand type label, overridden by each subtype
+    ANNOTATION_TYPE = "unknown"
+
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey("content_type", "object_id")
@@ -45,9 +49,10 @@ class BaseAnnotation(models.Model):
     def __str__(self):
         return self.selected_text or "-"
 
-    @property
+    @cached_property
     def excerpt(self):
-        # Truncated annotation content for admin list view
+        # Truncated annotation content for admin list view; cached per
+        # instance since the strip/truncate/unescape chain isn't free
         return unescape(truncatechars(strip_tags(self.annotation or "-"), 48))
 
     @property
@@ -55,13 +60,7 @@ class BaseAnnotation(models.Model):
         """
         Returns the shorthand annotation type for the inheriting models.
         """
-        if isinstance(self, EditorialNote):
-            return "note"
-        if isinstance(self, CrossReference):
-            return "reference"
-        if isinstance(self, TextualVariant):
-            return "variant"
-        return "unknown"
+        return self.ANNOTATION_TYPE
 
     def sanitize_json_field(self, json_data):
         # helper method to force numeric values in the JSON fields
@@ -96,14 +95,20 @@ class BaseAnnotation(models.Model):
 class EditorialNote(BaseAnnotation):
     """An annotation of type Editorial Note"""
 
+    ANNOTATION_TYPE = "note"
+
 
 class CrossReference(BaseAnnotation):
     """An annotation of type Cross Reference"""
 
+    ANNOTATION_TYPE = "reference"
+
 
 class TextualVariant(BaseAnnotation):
     """An annotation of type Textual Variant, with additional metadata"""
 
+    ANNOTATION_TYPE = "variant"
+
     class Meta:
         constraints = [
             models.CheckConstraint(
@@ -111,6 +116,16 @@ class TextualVariant(BaseAnnotation):
                 name="significance_valid_range",
             )
         ]
+        indexes = [
+            # this Meta override dropped the base-class index, so the
+            # generic-relation lookups scanned; the manuscript-scoped
+            # variant serves the per-manuscript stanza prefetch
+            models.Index(fields=["content_type", "object_id"], name="tv_ct_obj_idx"),
+            models.Index(
+                fields=["manuscript", "content_type", "object_id"],
+                name="tv_ms_ct_obj_idx",
+            ),
+        ]
 
     annotation = RichTextField(
         "Variant text",
@@ -6,6 +6,11 @@ from manuscript.models import SingleManuscript, Stanza, StanzaTranslated
 from textannotation.models import TextualVariant
 
 
+def _normalize_line_code(code):
+    """Zero-pad a dotted line code (e.g. "1.2.3" -> "01.02.03")."""
+    return ".".join(f"{int(part):02d}" for part in code.split("."))
+
+
 class TextualVariantResource(resources.ModelResource):
     """Resource for importing TextualVariant records"""
 
@@ -49,6 +54,38 @@ class TextualVariantResource(resources.ModelResource):
             "object_id",
         )
 
+    def before_import(self, dataset, **kwargs):
+        # Resolve stanzas, manuscripts, and the content type once for
+        # the whole file instead of two queries per row
+        line_codes = set()
+        if "LineCodeStart" in dataset.headers:
+            for raw_code in dataset["LineCodeStart"]:
+                if not raw_code:
+                    continue
+                try:
+                    line_codes.add(_normalize_line_code(raw_code))
+                except ValueError:
+                    # malformed codes fail per-row with a proper error
+                    continue
+        self._stanzas_by_line_code = {
+            stanza.stanza_line_code_starts: stanza
+            for stanza in Stanza.objects.filter(
+                stanza_line_code_starts__in=line_codes
+            ).only("id", "stanza_line_code_starts", "stanza_text")
+        }
+
+        sigla = set()
+        if "Siglum" in dataset.headers:
+            sigla = {siglum for siglum in dataset["Siglum"] if siglum}
+        self._manuscript_ids_by_siglum = dict(
+            SingleManuscript.objects.filter(siglum__in=sigla).values_list(
+                "siglum", "id"
+            )
+        )
+
+        self._stanza_ct_id = ContentType.objects.get_for_model(Stanza).id
+        return super().before_import(dataset, **kwargs)
+
     def before_import_row(self, row, **kwargs):
         # process line codes
         row_line_code_start = row.get("LineCodeStart")
@@ -58,40 +95,34 @@ class TextualVariantResource(resources.ModelResource):
 
         row_line_code_end = row.get("LineCodeEnd")
         multi_line = row_line_code_end != row_line_code_start
-        line_code_start = ".".join(
-            f"{int(part):02d}" for part in row_line_code_start.split(".")
-        )
-        line_code_end = ".".join(
-            f"{int(part):02d}" for part in row_line_code_end.split(".")
-        )
+        line_code_start = _normalize_line_code(row_line_code_start)
+        line_code_end = _normalize_line_code(row_line_code_end)
         if multi_line and line_code_end < line_code_start:
             raise ValueError(
                 f"LineCodeStart {row_line_code_start} is after LineCodeEnd {row_line_code_end}. Cannot parse."
             )
 
         # NOTE: assumes Stanza (not Translated) because these are Textual Variants
-        stanza = Stanza.objects.filter(
-            stanza_line_code_starts=line_code_start,
-        ).first()
+        stanza = self._stanzas_by_line_code.get(line_code_start)
         if not stanza:
             # no stanza found for line code; skip
             row["_skip"] = True
             return
 
         # set GFK properties
-        row["content_type"] = ContentType.objects.get_for_model(Stanza).id
+        row["content_type"] = self._stanza_ct_id
         row["object_id"] = stanza.id
 
         # get manuscript by siglum
         siglum = row.get("Siglum")
-        manuscript = SingleManuscript.objects.filter(siglum=siglum).first()
-        if not manuscript:
+        manuscript_id = self._manuscript_ids_by_siglum.get(siglum)
+        if not manuscript_id:
             # error: prompt to create manuscript first
             raise ValueError(
                 f"Manuscript with siglum '{siglum}' does not exist. "
                 f"Please create the manuscript record before importing variants."
             )
-        row["manuscript"] = manuscript.id
+        row["manuscript"] = manuscript_id
 
         # handle text selection
         stanza_text = stanza.stanza_text or ""